@@ -0,0 +1,626 @@
+"""In-memory stand-in for the parts of Anvil that mytables uses.
+
+install() registers fake ``anvil``, ``anvil.server``, ``anvil._server``,
+``anvil.tables`` and ``anvil.tables.query`` modules so that
+``server_code/my_app_tables.py`` can be imported and exercised without an
+Anvil server. Every simulated server round trip is counted and can be given
+an artificial latency, which is what makes the benchmarks meaningful:
+
+    import fake_anvil
+    fake_anvil.install(latency=0.002)
+    fake_anvil.add_table("employees", [("name", "string"), ("boss", "link_single")])
+
+load_mytables() installs the stand-in and imports the app's
+``my_app_tables`` module against it; the benchmarks and tests/ both use it.
+
+Only behaviour that mytables depends on is modelled. Rows fetched by a search
+or get arrive loaded; linked rows arrive unloaded and cost a round trip the
+first time one of their columns is read, as in Anvil.
+"""
+
+import fnmatch
+import functools
+import importlib
+import itertools
+import os
+import sys
+import threading
+import time
+import types
+
+_state = threading.local()
+_lock = threading.RLock()
+_ids = itertools.count(1)
+
+ROUND_TRIPS = 0
+LATENCY = 0.0
+CONFLICTS = 0
+
+
+# --- ROUND TRIPS ---
+
+
+def round_trip() -> None:
+    global ROUND_TRIPS
+    with _lock:
+        ROUND_TRIPS += 1
+    if LATENCY:
+        time.sleep(LATENCY)
+
+
+def reset_round_trips() -> int:
+    global ROUND_TRIPS
+    with _lock:
+        count, ROUND_TRIPS = ROUND_TRIPS, 0
+    return count
+
+
+def set_latency(seconds: float) -> None:
+    global LATENCY
+    LATENCY = seconds
+
+
+def simulate_conflicts(count: int) -> None:
+    # The next `count` transactions to commit raise TransactionConflict
+    global CONFLICTS
+    CONFLICTS = count
+
+
+# --- ERRORS ---
+
+
+class TransactionConflict(Exception):
+    pass
+
+
+class NoSuchColumnError(KeyError):
+    pass
+
+
+class TableError(Exception):
+    pass
+
+
+# --- TRANSACTIONS ---
+
+
+def _journal(undo) -> None:
+    # Records how to reverse a write if the enclosing transaction aborts
+    stack = getattr(_state, "transactions", None)
+    if stack:
+        stack[-1].append(undo)
+
+
+class Transaction:
+    def __init__(self, relaxed: bool = False):
+        self.relaxed = relaxed
+        self._aborted = False
+
+    def __enter__(self):
+        if not hasattr(_state, "transactions"):
+            _state.transactions = []
+        _state.transactions.append([])
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global CONFLICTS
+        undo = _state.transactions.pop()
+        failed = exc_type is not None or self._aborted
+        if not failed and not _state.transactions and CONFLICTS > 0:
+            CONFLICTS -= 1
+            failed = True
+            exc = TransactionConflict("Another transaction changed this data.")
+
+        if failed:
+            for action in reversed(undo):
+                action()
+            if exc_type is None and not self._aborted:
+                raise exc
+        elif _state.transactions:
+            # Nested: the outer transaction decides whether to keep the writes
+            _state.transactions[-1].extend(undo)
+
+        return self._aborted and exc_type is None
+
+    def abort(self) -> None:
+        self._aborted = True
+
+
+def in_transaction(function=None, relaxed: bool = False):
+    if function is None:
+        return lambda f: in_transaction(f, relaxed=relaxed)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        # Like Anvil, conflicting transactions are retried a few times
+        for attempt in itertools.count():
+            try:
+                with Transaction(relaxed=relaxed):
+                    return function(*args, **kwargs)
+            except TransactionConflict:
+                if attempt >= 4:
+                    raise
+
+    return wrapper
+
+
+# --- LIVE OBJECTS ---
+
+
+class LiveObjectProxy:
+    def __init__(self, spec: dict):
+        self._spec = spec
+
+    def __repr__(self):
+        return f"<LiveObject: {self._spec['backend']}>"
+
+
+class Row(LiveObjectProxy):
+    def __init__(self, table: "Table", row_id: int, loaded: bool = True):
+        super().__init__({"backend": "anvil.tables.Row", "id": row_id})
+        self._table = table
+        self._id = row_id
+        self._loaded = loaded
+
+    def _data(self) -> dict:
+        data = self._table._rows.get(self._id)
+        if data is None:
+            raise TableError("This row has been deleted")
+        if not self._loaded:
+            round_trip()
+            self._loaded = True
+        return data
+
+    def __getitem__(self, column):
+        data = self._data()
+        if column not in data:
+            raise NoSuchColumnError(column)
+        return _read(data[column])
+
+    def __setitem__(self, column, value):
+        self.update(**{column: value})
+
+    def __iter__(self):
+        return iter([(key, _read(value)) for key, value in self._data().items()])
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Row)
+            and other._table is self._table
+            and other._id == self._id
+        )
+
+    def __hash__(self):
+        return hash((id(self._table), self._id))
+
+    def keys(self):
+        return list(self._data().keys())
+
+    def get_id(self) -> str:
+        return f"[{self._table._table_id},{self._id}]"
+
+    def update(self, **kwargs):
+        round_trip()
+        data = self._data()
+        self._table._check_columns(kwargs)
+        old = {key: data[key] for key in kwargs}
+        _journal(lambda: data.update(old))
+        data.update(_store(kwargs))
+
+    def delete(self):
+        round_trip()
+        data = self._table._rows.pop(self._id, None)
+        if data is not None:
+            _journal(lambda: self._table._rows.__setitem__(self._id, data))
+
+
+def _store(values: dict) -> dict:
+    # Linked rows are stored by reference so reads can hand out fresh,
+    # unloaded Row objects the way Anvil does.
+    stored = {}
+    for key, value in values.items():
+        if isinstance(value, Row):
+            value = ("__row__", value._table, value._id)
+        elif isinstance(value, list) and any(isinstance(v, Row) for v in value):
+            value = [("__row__", v._table, v._id) for v in value]
+        stored[key] = value
+    return stored
+
+
+def _read(value):
+    if isinstance(value, tuple) and len(value) == 3 and value[0] == "__row__":
+        return Row(value[1], value[2], loaded=False)
+    if isinstance(value, list):
+        return [_read(item) for item in value]
+    return value
+
+
+class SearchIterator(LiveObjectProxy):
+    def __init__(self, table: "Table", row_ids: list, page_size: int = 100):
+        super().__init__({"backend": "anvil.tables.SearchIterator"})
+        self._table = table
+        self._row_ids = row_ids
+        self._page_size = page_size
+
+    def __len__(self):
+        return len(self._row_ids)
+
+    def __iter__(self):
+        for index, row_id in enumerate(self._row_ids):
+            if index and index % self._page_size == 0:
+                round_trip()
+            if row_id in self._table._rows:
+                yield Row(self._table, row_id)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            round_trip()
+            return SearchIterator(self._table, self._row_ids[key], self._page_size)
+        round_trip()
+        return Row(self._table, self._row_ids[key])
+
+    def delete_all_rows(self):
+        round_trip()
+        for row_id in self._row_ids:
+            data = self._table._rows.pop(row_id, None)
+            if data is not None:
+                _journal(
+                    lambda row_id=row_id, data=data: self._table._rows.__setitem__(
+                        row_id, data
+                    )
+                )
+
+
+# --- QUERIES ---
+
+
+class _Query:
+    def __init__(self, *values, **columns):
+        self.values = values
+        self.columns = columns
+
+    def matches(self, value) -> bool:
+        raise NotImplementedError
+
+    def matches_row(self, data: dict) -> bool:
+        return all(_matches(_read(data.get(k)), v) for k, v in self.columns.items())
+
+
+def _comparison(compare):
+    class Comparison(_Query):
+        def matches(self, value):
+            return value is not None and compare(value, self.values[0])
+
+    return Comparison
+
+
+class between(_Query):
+    def __init__(self, min, max, min_inclusive=True, max_inclusive=False):
+        super().__init__(min, max)
+        self.min_inclusive = min_inclusive
+        self.max_inclusive = max_inclusive
+
+    def matches(self, value):
+        low, high = self.values
+        if value is None:
+            return False
+        above = value >= low if self.min_inclusive else value > low
+        below = value <= high if self.max_inclusive else value < high
+        return above and below
+
+
+class like(_Query):
+    def _pattern(self, value):
+        return self.values[0].replace("%", "*").replace("_", "?"), value
+
+    def matches(self, value):
+        if value is None:
+            return False
+        pattern, value = self._pattern(value)
+        return fnmatch.fnmatchcase(value, pattern)
+
+
+class ilike(like):
+    def _pattern(self, value):
+        pattern, value = super()._pattern(value)
+        return pattern.lower(), value.lower()
+
+
+class full_text_match(_Query):
+    def matches(self, value):
+        return value is not None and all(
+            word.lower() in value.lower() for word in self.values[0].split()
+        )
+
+
+class any_of(_Query):
+    def matches(self, value):
+        return any(_matches(value, option) for option in self.values)
+
+    def matches_row(self, data):
+        return any(
+            _matches(_read(data.get(k)), v) for k, v in self.columns.items()
+        ) or any(v.matches_row(data) for v in self.values if isinstance(v, _Query))
+
+
+class all_of(_Query):
+    def matches(self, value):
+        return all(_matches(value, option) for option in self.values)
+
+    def matches_row(self, data):
+        return super().matches_row(data) and all(
+            v.matches_row(data) for v in self.values if isinstance(v, _Query)
+        )
+
+
+class none_of(_Query):
+    def matches(self, value):
+        return not any(_matches(value, option) for option in self.values)
+
+    def matches_row(self, data):
+        return not any(
+            _matches(_read(data.get(k)), v) for k, v in self.columns.items()
+        ) and not any(
+            v.matches_row(data) for v in self.values if isinstance(v, _Query)
+        )
+
+
+class not_(none_of):
+    pass
+
+
+class page_size:
+    def __init__(self, rows: int):
+        self.rows = rows
+
+
+class fetch_only:
+    def __init__(self, *columns, **links):
+        self.columns = columns
+        self.links = links
+
+
+class order_by:
+    def __init__(self, column: str, ascending: bool = True):
+        self.column = column
+        self.ascending = ascending
+
+
+def _matches(value, criterion) -> bool:
+    if isinstance(criterion, _Query):
+        return criterion.matches(value)
+    if isinstance(value, list) and not isinstance(criterion, list):
+        return criterion in value
+    return value == criterion
+
+
+# --- TABLES ---
+
+
+class Table:
+    def __init__(self, name: str, columns: list):
+        self._name = name
+        self._table_id = next(_ids)
+        self._columns = [dict(column) for column in columns]
+        self._rows = {}
+
+    def __repr__(self):
+        return f"<Table: {self._name}>"
+
+    def _check_columns(self, values: dict) -> None:
+        names = {column["name"] for column in self._columns}
+        for key in values:
+            if key not in names:
+                raise NoSuchColumnError(f"No such column '{key}'")
+
+    def _insert(self, values: dict) -> Row:
+        self._check_columns(values)
+        row_id = next(_ids)
+        data = {column["name"]: None for column in self._columns}
+        data.update(_store(values))
+        self._rows[row_id] = data
+        _journal(lambda: self._rows.pop(row_id, None))
+        return Row(self, row_id)
+
+    def _select(self, args: tuple, kwargs: dict) -> list:
+        self._check_columns(kwargs)
+        row_ids = list(self._rows)
+        for arg in args:
+            if isinstance(arg, _Query):
+                row_ids = [i for i in row_ids if arg.matches_row(self._rows[i])]
+        for column, criterion in kwargs.items():
+            row_ids = [
+                i
+                for i in row_ids
+                if _matches(_read(self._rows[i][column]), criterion)
+            ]
+        for order in reversed([arg for arg in args if isinstance(arg, order_by)]):
+            row_ids.sort(
+                key=lambda i: (
+                    self._rows[i][order.column] is None,
+                    self._rows[i][order.column],
+                ),
+                reverse=not order.ascending,
+            )
+        return row_ids
+
+    def list_columns(self) -> list:
+        round_trip()
+        return [dict(column) for column in self._columns]
+
+    def add_row(self, **kwargs) -> Row:
+        round_trip()
+        return self._insert(kwargs)
+
+    def add_rows(self, rows: list) -> list:
+        round_trip()
+        return [self._insert(values) for values in rows]
+
+    def get(self, *args, **kwargs):
+        round_trip()
+        row_ids = self._select(args, kwargs)
+        if len(row_ids) > 1:
+            raise TableError("More than one row matched this query")
+        return Row(self, row_ids[0]) if row_ids else None
+
+    def get_by_id(self, row_id: str):
+        round_trip()
+        try:
+            table_id, number = (int(part) for part in row_id.strip("[]").split(","))
+        except ValueError:
+            return None
+        if table_id != self._table_id or number not in self._rows:
+            return None
+        return Row(self, number)
+
+    def search(self, *args, **kwargs) -> SearchIterator:
+        round_trip()
+        sizes = [arg.rows for arg in args if isinstance(arg, page_size)]
+        return SearchIterator(self, self._select(args, kwargs), *sizes[-1:])
+
+    def has_row(self, row: Row) -> bool:
+        round_trip()
+        return row._table is self and row._id in self._rows
+
+    def delete_all_rows(self) -> None:
+        round_trip()
+        rows, self._rows = self._rows, {}
+        _journal(lambda: self._rows.update(rows))
+
+    def to_csv(self) -> str:
+        round_trip()
+        names = [column["name"] for column in self._columns]
+        lines = [",".join(names)]
+        for data in self._rows.values():
+            lines.append(",".join(str(data[name]) for name in names))
+        return "\n".join(lines) + "\n"
+
+
+class AppTables:
+    def __getitem__(self, name: str) -> Table:
+        return getattr(self, name)
+
+    def __iter__(self):
+        return iter(vars(self))
+
+
+app_tables = AppTables()
+
+
+def add_table(name: str, columns: list) -> Table:
+    # columns is a list of (name, type) pairs using list_columns() type names
+    table = Table(name, [{"name": n, "type": t} for n, t in columns])
+    setattr(app_tables, name, table)
+    return table
+
+
+def drop_tables() -> None:
+    for name in list(vars(app_tables)):
+        delattr(app_tables, name)
+
+
+# --- SERVER ---
+
+_callables = {}
+
+
+def _callable(name=None, **options):
+    def register(function, name=name):
+        _callables[name or function.__name__] = function
+        return function
+
+    if callable(name):
+        return register(name, None)
+    return register
+
+
+def _call(name, *args, **kwargs):
+    round_trip()
+    return _callables[name](*args, **kwargs)
+
+
+class BlobMedia:
+    def __init__(self, content_type: str, content: bytes, name: str = None):
+        self.content_type = content_type
+        self._content = content
+        self.name = name
+
+    def get_bytes(self) -> bytes:
+        return self._content
+
+
+def install(latency: float = 0.0):
+    set_latency(latency)
+
+    anvil = types.ModuleType("anvil")
+    server = types.ModuleType("anvil.server")
+    _server = types.ModuleType("anvil._server")
+    tables = types.ModuleType("anvil.tables")
+    query = types.ModuleType("anvil.tables.query")
+
+    anvil.BlobMedia = BlobMedia
+    anvil.server = server
+    anvil._server = _server
+    anvil.tables = tables
+
+    server.callable = _callable
+    server.call = _call
+    server.background_task = lambda function: function
+
+    _server.LiveObjectProxy = LiveObjectProxy
+
+    tables.Row = Row
+    tables.SearchIterator = SearchIterator
+    tables.Table = Table
+    tables.app_tables = app_tables
+    tables.in_transaction = in_transaction
+    tables.Transaction = Transaction
+    tables.TransactionConflict = TransactionConflict
+    tables.NoSuchColumnError = NoSuchColumnError
+    tables.TableError = TableError
+    tables.order_by = order_by
+    tables.query = query
+
+    query.greater_than = _comparison(lambda a, b: a > b)
+    query.greater_than_or_equal_to = _comparison(lambda a, b: a >= b)
+    query.less_than = _comparison(lambda a, b: a < b)
+    query.less_than_or_equal_to = _comparison(lambda a, b: a <= b)
+    for member in (
+        between,
+        like,
+        ilike,
+        full_text_match,
+        any_of,
+        all_of,
+        none_of,
+        not_,
+        page_size,
+        fetch_only,
+    ):
+        setattr(query, member.__name__, member)
+
+    sys.modules.update(
+        {
+            "anvil": anvil,
+            "anvil.server": server,
+            "anvil._server": _server,
+            "anvil.tables": tables,
+            "anvil.tables.query": query,
+        }
+    )
+    return tables
+
+
+def load_mytables():
+    # The app's modules live in server_code/ and client_code/ of one package,
+    # as in Anvil; rebuild that package so relative imports work.
+    install()
+    if "mytables" not in sys.modules:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        package = types.ModuleType("mytables")
+        package.__path__ = [
+            os.path.join(root, "server_code"),
+            os.path.join(root, "client_code"),
+        ]
+        sys.modules["mytables"] = package
+    return importlib.import_module("mytables.my_app_tables")
@@ -0,0 +1,405 @@
+"""Benchmarks for mytables against the in-memory Anvil stand-in.
+
+Run from the repository root:
+
+    python benchmarks/run.py                       # print results
+    python benchmarks/run.py --latency 0.002       # simulate 2ms round trips
+    python benchmarks/run.py --output new.json     # record results
+    python benchmarks/run.py --compare old.json    # fail on regressions
+
+Each benchmark reports the time per operation and the number of simulated
+server round trips per operation; memory benchmarks report the bytes
+allocated per wrapped row. --compare exits with status 1 when any benchmark
+is slower, or uses more memory, than the recorded run by more than
+--threshold.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+
+import fake_anvil  # noqa: E402
+
+BENCHMARKS = []
+MEMORY_BENCHMARKS = []
+
+
+def benchmark(name: str, ops: int):
+    def register(function):
+        BENCHMARKS.append((name, ops, function))
+        return function
+
+    return register
+
+
+def memory_benchmark(name: str, rows: int):
+    def register(function):
+        MEMORY_BENCHMARKS.append((name, rows, function))
+        return function
+
+    return register
+
+
+mt = fake_anvil.load_mytables()
+
+
+# --- FIXTURES ---
+
+
+def build_tables(rows: int, chain_depth: int) -> dict:
+    fake_anvil.drop_tables()
+    products = fake_anvil.add_table("products", [("sku", "string")])
+    customers = fake_anvil.add_table(
+        "customers", [("name", "string"), ("email", "string")]
+    )
+    items = fake_anvil.add_table(
+        "items", [("product", "link_single"), ("quantity", "number")]
+    )
+    orders = fake_anvil.add_table(
+        "orders",
+        [
+            ("total", "number"),
+            ("note", "string"),
+            ("customer", "link_single"),
+            ("items", "link_multiple"),
+            ("meta", "simpleObject"),
+        ],
+    )
+    chain = fake_anvil.add_table("chain", [("name", "string"), ("next", "link_single")])
+    fake_anvil.add_table("events", [("kind", "string"), ("payload", "simpleObject")])
+
+    product_rows = [products.add_row(sku=f"sku-{i}") for i in range(20)]
+    customer_rows = [
+        customers.add_row(name=f"customer {i}", email=f"c{i}@example.com")
+        for i in range(25)
+    ]
+    item_rows = [
+        items.add_row(product=product_rows[i % 20], quantity=i) for i in range(50)
+    ]
+    for i in range(rows):
+        orders.add_row(
+            total=i,
+            note=f"order {i}",
+            customer=customer_rows[i % 25],
+            items=[item_rows[i % 50], item_rows[(i + 7) % 50]],
+            meta={"channel": "web", "index": i},
+        )
+
+    link = None
+    for i in range(chain_depth):
+        link = chain.add_row(name=f"link {i}", next=link)
+
+    fake_anvil.reset_round_trips()
+    return {"orders": orders, "chain": chain, "head": link}
+
+
+# --- BENCHMARKS ---
+
+
+@benchmark("myrow_construct_lazy", ops=1000)
+def bench_myrow_lazy(fixtures, ops):
+    rows = list(fixtures["orders"].search())[:ops]
+    fake_anvil.reset_round_trips()
+    return lambda: [mt.MyRow(row) for row in rows]
+
+
+@benchmark("myrow_construct_eager", ops=200)
+def bench_myrow_eager(fixtures, ops):
+    rows = list(fixtures["orders"].search())[:ops]
+    fake_anvil.reset_round_trips()
+    return lambda: [mt.MyRow(row, eager=True) for row in rows]
+
+
+@benchmark("search_iterate", ops=1000)
+def bench_search_iterate(fixtures, ops):
+    table = mt.MyTable("orders")
+    return lambda: [row["total"] for row in table.search()]
+
+
+@benchmark("search_iterate_instrumented", ops=1000)
+def bench_search_instrumented(fixtures, ops):
+    table = mt.MyTable("orders")
+
+    def task():
+        with mt.instrument():
+            return [row["total"] for row in table.search()]
+
+    return task
+
+
+@benchmark("search_iterate_links", ops=1000)
+def bench_search_links(fixtures, ops):
+    table = mt.MyTable("orders")
+    return lambda: [row["customer"]["name"] for row in table.search()]
+
+
+@benchmark("search_iterate_links_prefetch", ops=1000)
+def bench_search_links_prefetch(fixtures, ops):
+    table = mt.MyTable("orders")
+    return lambda: [
+        row["customer"]["name"] for row in table.search(prefetch=["customer"])
+    ]
+
+
+@benchmark("serialize_search", ops=1000)
+def bench_serialize(fixtures, ops):
+    table = mt.MyTable("orders")
+    return lambda: table.search().serialize(depth=1)
+
+
+@benchmark("serialize_search_projected", ops=1000)
+def bench_serialize_projected(fixtures, ops):
+    table = mt.MyTable("orders")
+    return lambda: table.search().serialize(columns=["total", "customer.name"])
+
+
+@benchmark("serialize_chain_depth_500", ops=1)
+def bench_serialize_chain(fixtures, ops):
+    head = fixtures["head"]
+    return lambda: mt.Serializer().serialize(head)
+
+
+@benchmark("myrow_eager_chain_depth_50", ops=1)
+def bench_eager_chain(fixtures, ops):
+    table = mt.MyTable("chain")
+    head = table.get(name="link 49", return_anvil=True)
+    return lambda: mt.MyRow(head, eager=True)
+
+
+@benchmark("get", ops=200)
+def bench_get(fixtures, ops):
+    table = mt.MyTable("customers")
+    return lambda: [table.get(email=f"c{i % 25}@example.com") for i in range(ops)]
+
+
+@benchmark("get_replicated", ops=200)
+def bench_get_replicated(fixtures, ops):
+    table = mt.MyTable("customers")
+    table.replicate(index_on=["email"])
+    fake_anvil.reset_round_trips()
+    return lambda: [table.get(email=f"c{i % 25}@example.com") for i in range(ops)]
+
+
+@benchmark("classify_value", ops=20)
+def bench_classify(fixtures, ops):
+    row = next(iter(fixtures["orders"].search()))
+    values = [row[key] for key in row.keys()] * 4
+    fake_anvil.reset_round_trips()
+    return lambda: [mt._classify(value) for value in values]
+
+
+@benchmark("add_row", ops=200)
+def bench_add_row(fixtures, ops):
+    table = mt.MyTable("events")
+    return lambda: [
+        table.add_row(kind="click", payload={"i": i}) for i in range(ops)
+    ]
+
+
+@benchmark("add_rows_batched", ops=200)
+def bench_add_rows(fixtures, ops):
+    table = mt.MyTable("events")
+    return lambda: table.add_rows(
+        ({"kind": "click", "payload": {"i": i}} for i in range(ops)), batch_size=100
+    )
+
+
+# --- MEMORY BENCHMARKS ---
+
+
+def touch(row, columns):
+    for column in columns:
+        row[column]
+    return row
+
+
+@memory_benchmark("myrow_untouched", rows=10000)
+def memory_untouched(fixtures, rows):
+    table = mt.MyTable("orders")
+    anvil_rows = list(fixtures["orders"].search())[:rows]
+    return lambda: [mt.MyRow(row, table=table) for row in anvil_rows]
+
+
+@memory_benchmark("myrow_scalars_read", rows=10000)
+def memory_scalars(fixtures, rows):
+    table = mt.MyTable("orders")
+    anvil_rows = list(fixtures["orders"].search())[:rows]
+    columns = ["total", "note", "meta"]
+    return lambda: [touch(mt.MyRow(row, table=table), columns) for row in anvil_rows]
+
+
+@memory_benchmark("myrow_all_columns_read", rows=10000)
+def memory_all_columns(fixtures, rows):
+    table = mt.MyTable("orders")
+    anvil_rows = list(fixtures["orders"].search())[:rows]
+    columns = ["total", "note", "customer", "items", "meta"]
+    return lambda: [touch(mt.MyRow(row, table=table), columns) for row in anvil_rows]
+
+
+# --- RUNNER ---
+
+
+def run_benchmark(name, ops, setup, args) -> dict:
+    # Fresh tables for each benchmark so writes from one cannot skew another
+    fixtures = build_tables(rows=1000, chain_depth=500)
+    task = setup(fixtures, ops)
+    fake_anvil.reset_round_trips()
+
+    timings = []
+    round_trips = 0
+    for _ in range(args.repeat):
+        fake_anvil.reset_round_trips()
+        started = time.perf_counter()
+        task()
+        timings.append(time.perf_counter() - started)
+        round_trips = fake_anvil.reset_round_trips()
+
+    best = min(timings)
+    return {
+        "name": name,
+        "ops": ops,
+        "seconds": best,
+        "seconds_per_op": best / ops,
+        "ops_per_sec": ops / best if best else None,
+        "round_trips_per_op": round_trips / ops,
+    }
+
+
+def run_memory_benchmark(name, rows, setup) -> dict:
+    fixtures = build_tables(rows=rows, chain_depth=1)
+    task = setup(fixtures, rows)
+    # Wrapping once first keeps one-off allocations, such as a table's
+    # schema, out of the per-row figure
+    task()
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = task()
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del result
+
+    return {"name": name, "rows": rows, "bytes_per_row": allocated / rows}
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except Exception:
+        return None
+
+
+def compare(
+    results: list, baseline_path: str, threshold: float, section: str, metric: str
+) -> list:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {
+            result["name"]: result for result in json.load(f).get(section, [])
+        }
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(result["name"])
+        if previous is None or not previous[metric]:
+            continue
+        change = result[metric] / previous[metric] - 1
+        result["change"] = change
+        if change > threshold:
+            regressions.append(result["name"])
+    return regressions
+
+
+def print_results(results: list) -> None:
+    print(f"{'benchmark':34} {'us/op':>12} {'ops/sec':>12} {'trips/op':>9}  change")
+    for result in results:
+        change = result.get("change")
+        print(
+            f"{result['name']:34} {result['seconds_per_op'] * 1e6:12.2f} "
+            f"{result['ops_per_sec'] or 0:12.0f} {result['round_trips_per_op']:9.2f}"
+            f"  {'' if change is None else f'{change:+.1%}'}"
+        )
+
+
+def print_memory_results(results: list) -> None:
+    print(f"{'memory benchmark':34} {'rows':>12} {'bytes/row':>12}  change")
+    for result in results:
+        change = result.get("change")
+        print(
+            f"{result['name']:34} {result['rows']:12} {result['bytes_per_row']:12.1f}"
+            f"  {'' if change is None else f'{change:+.1%}'}"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default="", help="only run names containing this")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    fake_anvil.set_latency(args.latency)
+    results = [
+        run_benchmark(name, ops, setup, args)
+        for name, ops, setup in BENCHMARKS
+        if args.filter in name
+    ]
+    memory_results = [
+        run_memory_benchmark(name, rows, setup)
+        for name, rows, setup in MEMORY_BENCHMARKS
+        if args.filter in name
+    ]
+
+    regressions = []
+    if args.compare:
+        regressions = compare(
+            results, args.compare, args.threshold, "results", "seconds_per_op"
+        ) + compare(
+            memory_results, args.compare, args.threshold, "memory", "bytes_per_row"
+        )
+    print_results(results)
+    print()
+    print_memory_results(memory_results)
+
+    if args.output:
+        report = {
+            "meta": {
+                "revision": git_revision(),
+                "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "latency": args.latency,
+                "repeat": args.repeat,
+            },
+            "results": results,
+            "memory": memory_results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if regressions:
+        print(f"Regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
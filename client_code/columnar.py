@@ -0,0 +1,209 @@
+# Decoder for the columnar payloads made by ColumnarEncoder in
+# server_code/my_app_tables.py, e.g. MySearchIterator.serialize_columnar().
+# Rows are rebuilt lazily: a value is only decoded when it is read.
+
+WIRE_FORMAT = "columnar"
+WIRE_VERSION = 1
+
+WIRE_VALUE = "value"
+WIRE_LINK = "link"
+WIRE_LINKS = "links"
+
+
+class WireRow:
+    def __init__(self, decoder, row_id, columns, kinds, read):
+        self._decoder = decoder
+        self._id = row_id
+        self._columns = columns
+        self._kinds = kinds
+        # read(position) returns the encoded value of a column
+        self._read = read
+        self._positions = None
+        self._cache = {}
+
+    # --- MAGIC METHODS ---
+
+    def __repr__(self):
+        return "<WireRow: {}>".format(self._id)
+
+    def __getitem__(self, key):
+        if key in self._cache:
+            return self._cache[key]
+
+        if self._positions is None:
+            self._positions = {name: index for index, name in enumerate(self._columns)}
+        position = self._positions[key]
+        value = self._decoder._decode_value(self._kinds[position], self._read(position))
+        self._cache[key] = value
+        return value
+
+    def __contains__(self, key):
+        return key in self._columns
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __len__(self):
+        return len(self._columns)
+
+    def __eq__(self, other):
+        return isinstance(other, WireRow) and other._id == self._id
+
+    def __hash__(self):
+        return hash(self._id)
+
+    # --- PUBLIC METHODS ---
+
+    def get_id(self):
+        return self._id
+
+    def get(self, key, default=None):
+        if key not in self._columns:
+            return default
+        return self[key]
+
+    def keys(self):
+        return list(self._columns)
+
+    def values(self):
+        return [self[key] for key in self._columns]
+
+    def items(self):
+        return [(key, self[key]) for key in self._columns]
+
+    def to_dict(self):
+        # Linked rows stay WireRow objects
+        return dict(self.items())
+
+
+class WireRows:
+    # The rows of one payload, as a read-only sequence of WireRow objects
+    def __init__(self, decoder, payload, columns):
+        self._decoder = decoder
+        self._ids = payload["ids"]
+        self._names = payload["columns"]
+        self._kinds = payload["kinds"]
+        # (dictionary or None, values or codes) per column
+        self._columns = columns
+        self._rows = {}
+
+    def __repr__(self):
+        return "<WireRows: {} rows>".format(len(self))
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("WireRows index out of range")
+
+        row = self._rows.get(index)
+        if row is None:
+            row = WireRow(
+                self._decoder,
+                self._ids[index],
+                self._names,
+                self._kinds,
+                lambda position: self._cell(position, index),
+            )
+            self._rows[index] = row
+        return row
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def _cell(self, position, index):
+        dictionary, values = self._columns[position]
+        value = values[index]
+        if dictionary is None or value is None:
+            return value
+        return dictionary[value]
+
+    @property
+    def columns(self):
+        return list(self._names)
+
+    def column(self, name):
+        # Every value of one column, decoded
+        position = self._names.index(name)
+        kind = self._kinds[position]
+        return [
+            self._decoder._decode_value(kind, self._cell(position, index))
+            for index in range(len(self))
+        ]
+
+
+class ColumnarDecoder:
+    # Keeps the dictionaries and linked rows of earlier pages, which delta
+    # payloads refer to instead of resending. Pages must be decoded in order.
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._dictionaries = {}
+        self._schemas = []
+        self._links = {}
+        self._linked_rows = {}
+        self._page = None
+
+    # --- PRIVATE METHODS ---
+
+    def _decode_value(self, kind, value):
+        if value is None or kind == WIRE_VALUE:
+            return value
+        if kind == WIRE_LINK:
+            return self._linked(value)
+        return [self._linked(row_id) for row_id in value]
+
+    def _linked(self, row_id):
+        # Links beyond the encoded depth are left as their ids
+        row = self._linked_rows.get(row_id)
+        if row is not None:
+            return row
+
+        record = self._links.get(row_id)
+        if record is None:
+            return row_id
+
+        schema, values = record
+        columns, kinds = self._schemas[schema]
+        row = WireRow(self, row_id, columns, kinds, lambda position: values[position])
+        self._linked_rows[row_id] = row
+        return row
+
+    # --- PUBLIC METHODS ---
+
+    def decode(self, payload):
+        if payload.get("format") != WIRE_FORMAT or payload.get("version") != WIRE_VERSION:
+            raise ValueError("Not a columnar payload of version {}".format(WIRE_VERSION))
+
+        if not payload["delta"] or payload["page"] == 0:
+            self.reset()
+        elif self._page is None or payload["page"] != self._page + 1:
+            raise ValueError(
+                "Delta page {} decoded out of order".format(payload["page"])
+            )
+        self._page = payload["page"]
+
+        self._schemas.extend(payload["schemas"])
+        self._links.update(payload["links"])
+
+        columns = []
+        for name, column in zip(payload["columns"], payload["data"]):
+            if "codes" in column:
+                dictionary = self._dictionaries.setdefault(name, [])
+                dictionary.extend(column["dict"])
+                columns.append((dictionary, column["codes"]))
+            else:
+                columns.append((None, column["values"]))
+
+        return WireRows(self, payload, columns)
+
+
+def decode(payload):
+    return ColumnarDecoder().decode(payload)
@@ -14,6 +14,14 @@ my_table = MyTable("employees")
 - **Parameters:**
   - `name` (str): Name of the Anvil table to be managed.
 
+`MyTable.for_name(name)` returns a handle shared by the whole process, so server functions that need a table on every call only look it up and read its schema once:
+```python
+@anvil.server.callable
+def list_engineers():
+    return MyTable.for_name("employees").search(role="Engineer").serialize()
+```
+`MyTable.clear_registry()` drops the shared handles. `anvil.tables` is only imported when a table is first used, which keeps importing this module cheap.
+
 ### Methods
 
 #### `add_row`
@@ -41,15 +49,109 @@ my_table = MyTable("employees")
   - `row` (Union[Row, MyRow]): The row object to be updated.
   - `**kwargs`: Key-value pairs for the columns to be updated.
 
+#### `add_rows`
+- **Purpose:** Adds many rows in batches, committing each batch in a single transaction.
+- **Signature:** `add_rows(rows, batch_size: int = 500, return_anvil: bool = False, on_progress=None, stop_on_error: bool = False) -> List[BatchResult]`
+- **Example:**
+  ```python
+  # Importing employees in batches of 1000
+  results = my_table.add_rows(employee_dicts, batch_size=1000, on_progress=print)
+  failed = [result for result in results if not result.ok]
+  ```
+- **Arguments:**
+  - `rows` (Iterable[dict]): Column-value dictionaries, one per row. Any iterable works, including generators.
+  - `batch_size` (int): Number of rows committed per transaction.
+  - `return_anvil` (bool): If `True`, `BatchResult.rows` holds Anvil `Row` objects instead of `MyRow` objects.
+  - `on_progress` (callable): Called after every batch with a dict of `batch`, `rows`, `failed`, `elapsed` and `rows_per_sec`.
+  - `stop_on_error` (bool): If `True`, stops at the first failed batch.
+- **Returns:** One `BatchResult` per batch with `index`, `rows`, `error`, `elapsed` and `ok`. A failed batch is rolled back and its `rows` holds the input dictionaries.
+
+#### `update_rows`
+- **Purpose:** Updates many rows in batches, committing each batch in a single transaction.
+- **Signature:** `update_rows(updates, batch_size: int = 500, on_progress=None, stop_on_error: bool = False) -> List[BatchResult]`
+- **Example:**
+  ```python
+  # Giving every engineer a new title
+  updates = ((row, {"role": "Software Engineer"}) for row in my_table.search(role="Engineer"))
+  my_table.update_rows(updates)
+  ```
+- **Arguments:**
+  - `updates` (Iterable[Tuple[Union[Row, MyRow], dict]]): Pairs of the row to update and its new column values.
+  - `batch_size`, `on_progress`, `stop_on_error`: As for `add_rows`.
+
+#### `delete_rows`
+- **Purpose:** Deletes many rows in batches, deleting each batch in a single transaction.
+- **Signature:** `delete_rows(rows, batch_size: int = 500, on_progress=None, stop_on_error: bool = False) -> List[BatchResult]`
+- **Example:**
+  ```python
+  results = my_table.delete_rows(rows_to_remove)
+  retry = [row for result in results if not result.ok for row in result.rows]
+  ```
+- **Arguments:**
+  - `rows` (Iterable[Union[Row, MyRow]]): The rows to delete.
+  - `batch_size`, `on_progress`, `stop_on_error`: As for `add_rows`. A failed batch is rolled back, and its `BatchResult` keeps its rows so they can be retried.
+
+#### `delete_where`
+- **Purpose:** Deletes every row that matches a query, in chunks. Each chunk is deleted in its own transaction. If a purge is interrupted, the chunks already deleted stay deleted, and running the same call again carries on with the rows that are left. Given a `key` column, each chunk is deleted by key range with a single `delete_all_rows` call instead of one call per row.
+- **Signature:** `delete_where(*query, chunk_size: int = 500, key: str = None, dry_run: bool = False, on_progress=None, **kwargs) -> int`
+- **Example:**
+  ```python
+  cutoff = datetime.now() - timedelta(days=90)
+  expired = my_table.delete_where(created=q.less_than(cutoff), dry_run=True)
+  print(f"Deleting {expired} rows")
+
+  my_table.delete_where(
+      created=q.less_than(cutoff),
+      key="created",
+      chunk_size=1000,
+      on_progress=lambda p: print(p["rows"], p["rows_per_sec"]),
+  )
+  ```
+- **Arguments:**
+  - `*query`, `**kwargs`: The query, as for `search`.
+  - `chunk_size` (int): The number of rows to delete per transaction.
+  - `key` (str): A sortable column used to delete by range. Rows that share the last key of a chunk are deleted with it. If that would make a chunk more than twice `chunk_size`, as with a date column where a whole day shares one key, that chunk's rows are deleted one by one instead. Rows whose key is empty are deleted row by row at the end.
+  - `dry_run` (bool): If `True`, returns the number of matching rows and deletes nothing.
+  - `on_progress` (Callable): Called after each chunk with `batch`, `rows` (deleted so far), `elapsed` and `rows_per_sec`.
+- **Returns:** The number of rows deleted, or the number that would be deleted with `dry_run=True`.
+
+#### `writer`
+- **Purpose:** Returns a `TableWriter` that buffers rows in memory and adds them in batched transactions from a background thread. Use it to log events at a high rate without paying for one transaction per row.
+- **Signature:** `writer(flush_rows: int = 500, flush_interval: float = 1.0, max_queue: int = 10000, on_error=None) -> TableWriter`
+- **Example:**
+  ```python
+  events = MyTable.for_name("events").writer(flush_rows=200, flush_interval=0.5)
+  events.write(kind="login", user=user)
+  print(events.stats())
+  ```
+- **Arguments:**
+  - `flush_rows` (int): Rows committed per transaction. A batch is committed once it is full.
+  - `flush_interval` (float): Maximum number of seconds a row waits in a partly filled batch.
+  - `max_queue` (int): Maximum number of rows waiting to be written. Once it is reached, `write` blocks until there is room.
+  - `on_error` (callable): Called with the rows of a batch and the exception when the batch fails. Failed batches are rolled back and are not retried.
+- **`TableWriter` methods:**
+  - `write(timeout=None, **kwargs)` queues one row. It raises `queue.Full` if it waits longer than `timeout`.
+  - `write_many(rows)` queues several rows.
+  - `flush()` waits until every row written so far has been committed.
+  - `close()` flushes and stops the thread. `close()` also runs when a `with` block exits, and at interpreter exit.
+  - `stats()` returns the following:
+    - `queued` and `max_queue`.
+    - `rows_written` and `rows_failed`.
+    - `batches` and `failed_batches`.
+    - `last_flush_latency`, `mean_flush_latency` and `max_flush_latency`, in seconds.
+    - `closed`.
+
 #### `get`
 - **Purpose:** Retrieves a single row that matches specified criteria.
-- **Signature:** `get(**kwargs) -> Union[MyRow, Row, None]`
+- **Signature:** `get(return_anvil: bool = False, eager: bool = False, **kwargs) -> Union[MyRow, Row, None]`
 - **Example:**
   ```python
   # Retrieving an employee by name
   employee = my_table.get(name="Alice")
   ```
 - **Arguments:**
+  - `return_anvil` (bool): If `True`, returns the Anvil `Row` object.
+  - `eager` (bool): If `True`, converts every column of the returned `MyRow` up front.
   - `**kwargs`: Criteria for selecting the row, provided as column-value pairs.
 
 #### `get_by_id`
@@ -65,7 +167,7 @@ my_table = MyTable("employees")
 
 #### `search`
 - **Purpose:** Performs a search query on the table.
-- **Signature:** `search(*args, **kwargs) -> Union[SearchIterator, list]`
+- **Signature:** `search(*args, return_anvil: bool = False, eager: bool = False, page_size: int = 100, prefetch_pages: int = 0, prefetch: Iterable[str] = None, **kwargs) -> Union[MySearchIterator, SearchIterator]`
 - **Example:**
   ```python
   # Finding all engineers
@@ -75,8 +177,142 @@ my_table = MyTable("employees")
   ```
 - **Arguments:**
   - `*args`: Positional arguments for the search query.
+  - `return_anvil` (bool): If `True`, returns the Anvil `SearchIterator`.
+  - `eager` (bool): If `True`, each `MyRow` converts all of its columns up front.
+  - `page_size` (int): Number of rows wrapped at a time while iterating.
+  - `prefetch_pages` (int): Number of pages to fetch ahead of the caller on a background thread.
+  - `prefetch` (Iterable[str]): Link columns to load for a whole page at once, e.g. `["customer", "items.product"]`. The linked rows referenced by a page are collected, each distinct row is loaded once, and rows that reference the same linked row share one `MyRow`. Dotted paths follow links through several tables.
+  - `convert_limit` (int): Deprecated and ignored, with a `DeprecationWarning`. Results are always converted a page at a time.
   - `**kwargs`: Keyword arguments representing search criteria.
 
+#### `query`
+- **Purpose:** Starts a fluent query. Lookups, ordering and limits are compiled to `anvil.tables.query` expressions and `tables.order_by`, so rows are filtered, sorted and limited by the database instead of in Python.
+- **Signature:** `query() -> Query`
+- **Example:**
+  ```python
+  recent_seniors = (
+      my_table.query()
+      .where(age__gt=30, role__in=["Engineer", "Manager"])
+      .order_by("-created")
+      .limit(50)
+  )
+  for employee in recent_seniors:
+      print(employee["name"])
+  ```
+- **`Query` methods:** Each returns a new `Query`.
+  - `where(*predicates, **lookups)`: Lookups are `column__operator=value`. Without an operator, the lookup matches the value exactly. Several lookups on one column are combined with `q.all_of`.
+    - Comparisons: `gt`, `gte`, `lt`, `lte`, `ne`, and `between=(min, max)`, which includes `min` and excludes `max`.
+    - Sets: `in` and `not_in`.
+    - Text: `isnull`, `like`, `ilike`, `contains`, `icontains`, `startswith`, `endswith`, and `search`, which is a full-text match.
+    - Positional `q.*` expressions are passed through unchanged.
+  - `order_by(*columns)`: Columns to sort by. Prefix a column with `-` to sort it descending.
+  - `limit(rows)`: Returns at most this many rows.
+  - `only(*columns)`: Fetches only these columns, as `q.fetch_only`.
+- **Running a query:** Iterate over the query, or call one of these:
+  - `search(return_anvil=False, **options)`: Takes the same options as `MyTable.search`. Returns a `MySearchIterator`, or a `SearchIterator` when `return_anvil=True`.
+  - `first()`
+  - `count()`
+  - `compile()`: Returns the `(args, kwargs)` that the query passes to `search`.
+- **Pushdown warnings:** Some predicates cannot be evaluated by the database:
+  - `regex` lookups.
+  - `contains`, `icontains`, `startswith` and `endswith` values that contain `%` or `_`.
+  - Python callables passed to `where`.
+
+  These emit a `PushdownWarning`. They are then applied in Python to the rows the database returns, and `search()` returns a plain iterator of the matching rows.
+
+#### `serve_pages`
+- **Purpose:** Registers a server callable that serves the table to client grids a page at a time. Each page comes with an opaque cursor, and the next page continues from the last sort key instead of counting rows from the start, so deep pages are as fast as the first. Rows that share a sort key are neither repeated nor skipped. Only tables registered this way can be paged from the client. The client chooses only the sort key (one of `sort_keys`), the direction and the page size. The filter and columns are fixed on the server.
+- **Signature:** `serve_pages(sort_keys: Iterable[str], name: str = None, columns: Iterable[str] = None, query=None, depth: int = 0, page_size: int = 100, max_page_size: int = 500, max_ties: int = 5000, wire: str = "rows", authorize: Callable[[], bool] = None, require_user=None) -> PageEndpoint`
+- **Example:**
+  ```python
+  # Server module
+  MyTable("employees").serve_pages(
+      sort_keys=["name", "hired"],
+      columns=["name", "hired", "department.name"],
+      query={"active": True},
+      require_user=True,
+  )
+
+  # Client form
+  page = anvil.server.call("employees_page", sort="hired", descending=True)
+  while page["cursor"]:
+      page = anvil.server.call("employees_page", cursor=page["cursor"])
+  ```
+- **Arguments:**
+  - `sort_keys` (Iterable[str]): The columns clients may sort by. The first one is the default. Sort keys must be text, number, date or date-time columns. Rows whose sort key is empty are not served.
+  - `name` (str): The name of the server callable. Defaults to `<table name>_page`.
+  - `columns` (Iterable[str]): Columns to return, with dotted names for columns of linked rows. Linked rows are fetched with the page.
+  - `query`: A fixed filter, as in `export`.
+  - `depth` (int): How many levels of linked rows to include.
+  - `max_ties` (int): The most rows that may share one sort key. Rows sharing the last key of a page are listed in the cursor, so a longer run of equal keys raises a `ValueError`; sort by a more selective column instead. Cursors listing more rows than this are rejected.
+  - `wire` (str): `"rows"` returns a list of dictionaries, as `serialize` does. `"columnar"` returns a `serialize_columnar` payload.
+  - `authorize` (Callable): Called before each page is served. The call raises `PermissionError` unless it returns `True`.
+  - `require_user`: Passed to `anvil.server.callable`.
+- **Callable arguments:** `sort`, `cursor`, `page_size` and `descending`. A cursor already records the sort key and direction.
+- **Returns:** A `PageEndpoint`. The callable returns `{"rows", "cursor", "sort", "descending"}`, where `cursor` is `None` on the last page.
+
+#### `enable_cache`
+- **Purpose:** Turns on a process-local read-through cache for `get` and `get_by_id`. Entries are keyed by row ID and by the `get` criteria, expire after `ttl` seconds and are evicted least-recently-used once `max_size` is reached. Writes made through `add_row`, `update_row`, `add_rows`, `update_rows` and through `MyRow.update`/`delete` on rows read from this table invalidate the affected entries. Writes made any other way are only picked up when entries expire.
+- **Signature:** `enable_cache(max_size: int = 1000, ttl: float = 60.0) -> RowCache`
+- **Example:**
+  ```python
+  # Caching reference rows for up to five minutes
+  tenants = MyTable("tenants")
+  tenants.enable_cache(max_size=500, ttl=300)
+  tenant = tenants.get(slug="acme")
+  ```
+
+#### `disable_cache`
+- **Purpose:** Turns the cache off and drops its entries.
+- **Signature:** `disable_cache() -> None`
+
+#### `replicate`
+- **Purpose:** Loads a small, read-heavy table, such as statuses, tenants or feature flags, into memory once. After that, `get`, `get_by_id` and `search` lookups that only use column equality are answered locally without a round trip. Lookups on indexed columns use a hash index. Other equality lookups scan the in-memory rows. Some lookups still go to the database:
+  - Searches with positional query arguments.
+  - Lookups on list, simple object or media columns.
+  - `get` calls that match more than one row.
+
+  Rows written through this `MyTable` are re-read before the next lookup, so the replica stays consistent with them. Changes made elsewhere are picked up on refresh. Searches served by the replica wrap a list of rows, and with `return_anvil=True` they return that list.
+- **Signature:** `replicate(index_on: Iterable[str] = (), refresh: float = None, updated_column: str = None) -> Replica`
+- **Example:**
+  ```python
+  flags = MyTable.for_name("feature_flags")
+  flags.replicate(index_on=["name"], refresh=30, updated_column="updated_at")
+  if flags.get(name="new_checkout")["enabled"]:
+      ...
+  ```
+- **Arguments:**
+  - `index_on` (Iterable[str]): Columns to build hash indexes on. Text, number, boolean, date, datetime and single-link columns can be indexed.
+  - `refresh` (float): Seconds after which the next lookup refreshes the replica. If omitted, the replica only refreshes when `replica.refresh()` is called.
+  - `updated_column` (str): A datetime or number column that is set on every write. If given, a refresh only fetches rows newer than the newest one seen. The table is reloaded if its row count no longer matches, for example after rows are deleted elsewhere.
+- `drop_replica()` goes back to querying the database. `replica.stats()` reports `rows`, `indexes`, `hits`, `misses`, `refreshes` and `stale`.
+
+#### `set_transaction_policy`
+- **Purpose:** Configures how the table's writes run in transactions. This covers `add_row`, `update_row`, `add_rows`, `update_rows`, `MyRow.update`, `MyRow.flush` and the list and dict column helpers.
+  - When a transaction conflicts, it is retried up to `max_retries` times. Each retry waits a random delay of up to `base_delay * 2 ** attempt` seconds, capped at `max_delay`.
+  - `max_concurrency` limits how many of the table's transactions run at once.
+  - Calls made inside another of these transactions join it and are not retried separately.
+  - Outside a `batch()`, the list and dict column helpers read the column inside the transaction. On a retry they re-apply their change to the latest value instead of overwriting another writer's change.
+- **Signature:** `set_transaction_policy(max_retries: int = 8, base_delay: float = 0.05, max_delay: float = 2.0, max_concurrency: int = None) -> TransactionPolicy`
+- **Example:**
+  ```python
+  counters = MyTable.for_name("counters")
+  counters.set_transaction_policy(max_retries=10, max_concurrency=4)
+  ```
+
+#### `transaction_stats`
+- **Purpose:** Returns the `transactions`, `commits`, `conflicts`, `retries`, `aborts` and `backoff_time` counters of the table's transaction policy.
+- **Signature:** `transaction_stats() -> dict`
+
+#### `write_stats`
+- **Purpose:** Reports the writes made and avoided by dirty-field tracking. Before a write, each column's new value is compared with the value already loaded on the row. Columns that would not change are dropped. When nothing would change, no transaction is opened. Values of a different type, such as `1` and `1.0`, always count as changed. `MyRow` keeps a copy of its list and dict columns as they were read, so a dict that was edited in place and assigned back is still written. Assigning back the very list or dict object a plain Anvil row returned always counts as a change. This applies to `update_row`, `update_rows`, `MyRow.update`, item assignment, `flush` and the list and dict column helpers.
+- **Signature:** `write_stats() -> dict`
+- **Returns:** `writes`, `skipped_writes`, `columns_written` and `columns_skipped`. Writes are counted once their transaction commits, so retried conflicts are counted once.
+
+#### `cache_stats`
+- **Purpose:** Returns the cache's `size`, `max_size`, `ttl`, `hits`, `misses`, `evictions`, `expirations` and `invalidations` counters, or an empty dict when caching is off.
+- **Signature:** `cache_stats() -> dict`
+
 #### `has_row`
 - **Purpose:** Checks if the specified row exists in the table.
 - **Signature:** `has_row(row: Union[Row, MyRow]) -> bool`
@@ -107,6 +343,75 @@ my_table = MyTable("employees")
   csv_data = my_table.to_csv()
   ```
 
+#### `import_csv` / `import_jsonl`
+- **Purpose:** Streams rows in from a CSV file (with a header row) or a JSON Lines file and adds them in transactional batches. Values are converted to each column's type from `list_columns()`, and link columns are resolved through a memoized lookup, so each distinct key is only looked up once.
+- **Signature:** `import_csv(source, links: dict = None, batch_size: int = 500, rejects=None, checkpoint: str = None, on_progress=None) -> dict` (`import_jsonl` takes the same arguments)
+- **Example:**
+  ```python
+  # Importing orders, linking each one to a customer by email address
+  with anvil.media.TempFile(uploaded_file) as path:
+      summary = orders.import_csv(
+          path,
+          links={"customer": ("customers", "email")},
+          rejects="/tmp/orders_rejects.jsonl",
+          checkpoint="/tmp/orders_import.json",
+      )
+  ```
+- **Arguments:**
+  - `source`: A file path, or an open text file or other iterable of lines.
+  - `links` (dict): For each link column, either a table (`MyTable` or name), in which case values are row IDs, or a `(table, key_column)` pair to look rows up by a column value. Keys read from CSV are converted to the key column's type, so number and date keys match. Multi-link values in CSV are JSON lists of row IDs or keys.
+  - `batch_size` (int): Number of rows committed per transaction. If a batch fails, its rows are retried one at a time so only the bad rows are rejected.
+  - `rejects`: A file path or writable text file. Each rejected record is written as a JSON line holding its record number, data and error.
+  - `checkpoint` (str): A file path where the number of processed records is saved after every batch. If the file exists when the import starts, that many records are skipped, so a crashed import continues where it stopped.
+  - `on_progress` (callable): Called after every batch with a dict of `batch`, `records`, `rows`, `failed`, `skipped`, `elapsed` and `rows_per_sec`.
+- **Returns:** The final progress dict.
+
+#### `search_many`
+- **Purpose:** Runs several independent searches on this table concurrently. This is shorthand for `gather` with one `search` call per query.
+- **Signature:** `search_many(queries, return_anvil: bool = False, max_workers: int = 8, return_exceptions: bool = False) -> List[CallResult]`
+- **Example:**
+  ```python
+  engineers, managers = my_table.search_many([{"role": "Engineer"}, {"role": "Manager"}])
+  print(engineers.value, engineers.elapsed)
+  ```
+- **Arguments:**
+  - `queries`: Each query is a dict of column criteria, a query expression, or a list of query expressions.
+  - `return_anvil`, `max_workers`, `return_exceptions`: As for `search` and `gather`.
+
+#### `export`
+- **Purpose:** Streams the table, or the rows matching a query, as CSV or JSON Lines without building the whole export in memory. Rows are read `chunk_rows` at a time and each chunk is encoded and handed on before the next is read, so peak memory stays bounded however large the table is. Linked rows are written as their row IDs by default.
+- **Signature:** `export(fmt: str = "csv", query=None, columns: Iterable[str] = None, chunk_rows: int = 100, depth: int = 0, out=None)`
+- **Example:**
+  ```python
+  # Inside a background task: write all active employees to a file
+  @anvil.server.background_task
+  def export_employees(path):
+      with open(path, "w", newline="") as f:
+          my_table.export("csv", query={"active": True}, out=f)
+
+  # Or consume the chunks yourself
+  for chunk in my_table.export("jsonl", columns=["name", "manager.name"], depth=1):
+      send(chunk)
+  ```
+- **Arguments:**
+  - `fmt` (str): `"csv"` or `"jsonl"`.
+  - `query`: A dict of column criteria, a query expression, or a list of query expressions. Defaults to every row.
+  - `columns` (Iterable[str]): Columns to export, defaulting to every column. Dotted names project linked rows when `depth` is above `0`.
+  - `chunk_rows` (int): Number of rows read and encoded per chunk.
+  - `depth` (int): Levels of linked rows to expand. `0` writes links as row IDs.
+  - `out`: A writable text file-like object. If given, chunks are written to it and nothing is returned; otherwise a generator of string chunks is returned.
+
+#### `schema`
+- **Purpose:** Property holding the table's column names and types, read once from `list_columns()` and shared by every `MyRow` of the table.
+- **Example:**
+  ```python
+  print(my_table.schema.columns, my_table.schema.types)
+  ```
+
+#### `refresh_schema`
+- **Purpose:** Reads the table's columns again, after columns have been added or removed. Rows already read keep the schema they were read with.
+- **Signature:** `refresh_schema() -> Schema`
+
 #### `get_anvil_table`
 - **Purpose:** Retrieves the underlying Anvil table object.
 - **Signature:** `get_anvil_table()`
@@ -129,6 +434,8 @@ my_row = MyRow(anvil_row)
 ```
 - **Parameters:**
   - `row` (Row): An instance of Anvil's `Row` object.
+  - `eager` (bool): If `True`, every column and linked row is converted when the `MyRow` is created. By default columns are converted the first time they are read and cached per column, and linked rows become `MyRow` objects that are only fetched when dereferenced.
+  - `table` (MyTable): The table the row belongs to. Rows returned by `MyTable` methods have it set. Such rows keep their converted values in a list ordered by the table's `schema`, which is read once per table, instead of each row holding its own dictionary of column names. `MyRow` uses `__slots__`, so rows cannot be given extra attributes.
 
 ### Methods
 
@@ -143,6 +450,22 @@ my_row = MyRow(anvil_row)
 - **Arguments:**
   - `**kwargs`: Key-value pairs representing the column names and their new values.
 
+#### `batch`
+- **Purpose:** Context manager that collects column edits in memory and writes them with a single `row.update` in one transaction when the block exits. Edits made through `update`, item assignment and the list/dict column helpers are all deferred, and reads inside the block see the pending values. If the block raises, the pending edits are discarded. Nested blocks flush when the outermost one exits.
+- **Signature:** `batch()`
+- **Example:**
+  ```python
+  # Merging several settings with one write
+  with my_row.batch():
+      my_row.add_to_dict_column("settings", "theme", "dark")
+      my_row.add_to_dict_column("settings", "language", "en")
+      my_row["last_seen"] = now
+  ```
+
+#### `flush`
+- **Purpose:** Writes any edits collected by `batch` immediately, without leaving the block.
+- **Signature:** `flush() -> None`
+
 #### `delete`
 - **Purpose:** Deletes the row from the table.
 - **Signature:** `delete() -> None`
@@ -214,7 +537,7 @@ my_row = MyRow(anvil_row)
   - `key`: The key to be removed from the dictionary.
 
 #### `update_simple_object_column`
-- **Purpose:** Updates a column containing simple objects (dict or list).
+- **Purpose:** Updates a column containing simple objects (dict or list). Dictionary merges are written in a single transaction.
 - **Signature:** `update_simple_object_column(column: str, data: Union[dict, list])`
 - **Example:**
   ```python
@@ -230,7 +553,7 @@ my_row = MyRow(anvil_row)
 ## MySearchIterator Class
 
 ### Overview
-`MySearchIterator` enhances Anvil's `SearchIterator`, providing a more Pythonic way to iterate over and work with search results from Anvil tables.
+`MySearchIterator` enhances Anvil's `SearchIterator`, providing a more Pythonic way to iterate over and work with search results from Anvil tables. Rows are wrapped page by page as you iterate, so only one page of `MyRow` objects is held in memory however large the search is.
 
 ### Initialization
 ```python
@@ -240,6 +563,10 @@ my_search_iterator = MySearchIterator(search_result)
 ```
 - **Parameters:**
   - `search` (SearchIterator): An instance of Anvil's `SearchIterator`.
+  - `eager` (bool): If `True`, each `MyRow` converts all of its columns up front.
+  - `page_size` (int): Number of rows wrapped at a time. Indexing only fetches the page containing the requested row.
+  - `prefetch_pages` (int): Number of pages to fetch ahead while iterating. `0` disables look-ahead.
+  - `prefetch` (Iterable[str]): Link paths to load once per page; see `MyTable.search`.
 
 ### Methods
 
@@ -265,8 +592,8 @@ my_search_iterator = MySearchIterator(search_result)
   ```
 
 #### `__getitem__`
-- **Purpose:** Retrieves an item at a specific index from the search results.
-- **Signature:** `__getitem__(key: int) -> MyRow`
+- **Purpose:** Retrieves an item at a specific index from the search results. Only the page containing the index is fetched; slices return a new `MySearchIterator`.
+- **Signature:** `__getitem__(key: Union[int, slice]) -> Union[MyRow, MySearchIterator]`
 - **Example:**
   ```python
   # Accessing the third item in the search results
@@ -310,7 +637,7 @@ my_search_iterator = MySearchIterator(search_result)
 
 #### `serialize`
 - **Purpose:** Serializes the search results into a list of dictionaries.
-- **Signature:** `serialize() -> List[Dict]`
+- **Signature:** `serialize(columns: Iterable[str] = None, depth: int = None) -> List[Dict]`
 - **Example:**
   ```python
   # Serializing search results
@@ -319,6 +646,174 @@ my_search_iterator = MySearchIterator(search_result)
       print(result)
   ```
 
+#### `serialize_columnar`
+- **Purpose:** Serializes the search results into a compact payload for client forms. Column names are sent once, values are sent as one list per column, and string columns with many repeated values are sent as codes into a dictionary. Linked rows are sent once each in a table keyed by row ID, however many rows link to them. Decode the payload on the client with `columnar.decode`.
+- **Signature:** `serialize_columnar(columns: Iterable[str] = None, depth: int = 1) -> Dict`
+- **Example:**
+  ```python
+  @anvil.server.callable
+  def get_orders():
+      return MyTable("orders").search().serialize_columnar(["total", "customer.name"])
+  ```
+- **Arguments:**
+  - `columns` (Iterable[str]): Columns to include, with dotted names such as `customer.name` for columns of linked rows, as in `serialize`.
+  - `depth` (int): How many levels of linked rows to include. Links beyond this depth are left as row IDs.
+
+#### `serialize_columnar_pages`
+- **Purpose:** Like `serialize_columnar`, but yields one payload per page of results. With `delta=True`, dictionary entries and linked rows already sent in an earlier page are not sent again, so each page only carries what is new. Delta pages must be decoded in order by the same `ColumnarDecoder`.
+- **Signature:** `serialize_columnar_pages(columns: Iterable[str] = None, depth: int = 1, delta: bool = True) -> Iterator[Dict]`
+- **Example:**
+  ```python
+  for payload in my_table.search(page_size=200).serialize_columnar_pages():
+      send_to_client(payload)
+  ```
+
+#### Decoding on the client
+- **Purpose:** `client_code/columnar.py` turns payloads back into rows. `decode(payload)` returns a read-only sequence of row-like objects. Each row supports `row["column"]`, `get`, `keys`, `items`, `get_id` and `to_dict`. Linked rows are row-like objects too. Values are decoded when they are first read. Use a single `ColumnarDecoder` for a series of delta pages.
+- **Example:**
+  ```python
+  from ..columnar import ColumnarDecoder, decode
+
+  orders = decode(anvil.server.call("get_orders"))
+  for order in orders:
+      print(order["total"], order["customer"]["name"])
+
+  decoder = ColumnarDecoder()
+  for payload in pages:
+      rows = decoder.decode(payload)
+  ```
+
+#### `to_columns`
+- **Purpose:** Reads the search results into one NumPy array per column, for reporting and analysis. Rows are read a page at a time straight from Anvil and are never wrapped in `MyRow` objects. Number columns become float arrays, with `NaN` for empty cells. Other columns become object arrays, and linked rows are represented by their row IDs. For a search without a table schema, the type of each column is inferred from all of its values, and a column holding only empty cells stays an object array. Requires NumPy.
+- **Signature:** `to_columns(columns: Iterable[str] = None) -> Dict[str, numpy.ndarray]`
+- **Example:**
+  ```python
+  data = my_table.search(role="Engineer").to_columns(["name", "salary"])
+  print(data["salary"].mean())
+  ```
+- **Arguments:**
+  - `columns` (Iterable[str]): Columns to read. If omitted, every column of the table is read.
+
+#### `aggregate`
+- **Purpose:** Groups the search results and counts and sums them with vectorized NumPy operations. Pages are merged into running totals as they are read, so only one page of values is held at a time. Requires NumPy.
+- **Signature:** `aggregate(group_by: Union[str, Iterable[str]] = None, sum: Union[str, Iterable[str]] = None, count: bool = True) -> Dict[str, numpy.ndarray]`
+- **Example:**
+  ```python
+  totals = my_table.search().aggregate(group_by="department", sum="salary")
+  for department, employees, salaries in zip(
+      totals["department"], totals["count"], totals["salary_sum"]
+  ):
+      print(department, employees, salaries)
+  ```
+- **Arguments:**
+  - `group_by` (Union[str, Iterable[str]]): Columns to group by. If omitted, the whole result is one group.
+  - `sum` (Union[str, Iterable[str]]): Number columns to total per group. Empty cells count as zero.
+  - `count` (bool): If `True`, includes the number of rows in each group.
+- **Returns:** One array per group column, plus `count` and a `<column>_sum` array per summed column, with one entry per group.
+
+## Concurrent Calls
+
+### `gather`
+- **Purpose:** Runs independent calls on one or more tables on a bounded thread pool, so their round trips overlap instead of adding up. Results come back in the order the calls were given.
+- **Signature:** `gather(*calls: TableCall, max_workers: int = 8, return_exceptions: bool = False) -> List[CallResult]`
+- **Example:**
+  ```python
+  # Loading a dashboard's data in parallel
+  results = gather(
+      TableCall(employees, "search", role="Engineer"),
+      TableCall(projects, "search", active=True),
+      TableCall(tenants, "get_by_id", tenant_id, return_anvil=True),
+  )
+  for result in results:
+      print(result.call, result.elapsed, result.value)
+  ```
+- **Arguments:**
+  - `*calls` (TableCall): `TableCall(table, method, *args, **kwargs)` names a public `MyTable` method, such as `search`, `get` or `get_by_id`, and the arguments to call it with. The method runs with its usual behaviour, including `return_anvil`.
+  - `max_workers` (int): Maximum number of calls running at once.
+  - `return_exceptions` (bool): If `False`, the first failed call's exception is raised once every call has finished. If `True`, failures are returned in `CallResult.error` and the other results are still returned.
+- **Returns:** One `CallResult` per call with `call`, `value`, `error`, `elapsed` and `ok`.
+
+## Async API
+
+### Overview
+`AsyncMyTable` wraps a `MyTable` for asyncio code, such as Uplink workers. Its methods can be awaited without blocking the event loop. Each blocking call runs on a thread pool that is shared by the table and its searches. At most `max_workers` calls run at once. Methods take the same arguments and return the same values as their `MyTable` counterparts, including `return_anvil`.
+
+### Initialization
+```python
+async with AsyncMyTable("employees", max_workers=4) as employees:
+    alice = await employees.get(name="Alice")
+    async for engineer in employees.search(role="Engineer"):
+        print(engineer["name"])
+    await employees.add_rows(new_hires, batch_size=100)
+```
+- **Parameters:**
+  - `table` (Union[str, MyTable]): The table to wrap. A name is resolved with `MyTable.for_name`.
+  - `max_workers` (int): Maximum number of blocking calls running at once.
+  - `executor` (Executor): An existing executor to run calls on instead of a new thread pool. It is not shut down by `close()`.
+
+### Methods
+`add_row`, `update_row`, `add_rows`, `update_rows`, `get`, `get_by_id`, `has_row`, `list_columns`, `to_csv`, `import_csv` and `import_jsonl` are awaitable versions of the `MyTable` methods. `close()`, also called when an `async with` block exits, shuts down the thread pool.
+
+#### `search`
+- **Purpose:** Returns an `AsyncMySearchIterator`. The search runs when iteration starts. While one page is being consumed, the next page is fetched, and converted, on the thread pool.
+- **Signature:** `search(*args, return_anvil: bool = False, page_size: int = 100, **kwargs) -> AsyncMySearchIterator`
+
+### `AsyncMySearchIterator`
+- Supports `async for`, which yields `MyRow` objects, or Anvil rows when the search was made with `return_anvil=True`.
+- Its awaitable methods are `count()`, `get_index(index)`, `to_list()`, `serialize(columns, depth)`, `to_columns(columns)` and `aggregate(group_by, sum, count)`.
+- `get_search()` returns the underlying `MySearchIterator` or `SearchIterator`.
+
+## Serializer Class
+
+### Overview
+`Serializer` converts rows and search results into plain dictionaries and lists that can be returned to client code. It walks linked rows with an explicit stack, reads each cell once, and emits the row ID instead of expanding a row that is already being serialized higher up the chain, so circular links cannot loop forever.
+
+### Initialization
+```python
+# Example: Only the name and the linked manager's name, one level of links
+serializer = Serializer(columns=["name", "manager.name"], depth=1)
+data = serializer.serialize(my_row)
+```
+- **Parameters:**
+  - `columns` (Iterable[str]): Columns to read and emit. Dotted names project linked rows. If omitted, every column is emitted.
+  - `depth` (int): Number of levels of linked rows to expand. Deeper links are emitted as row IDs. If omitted, links are expanded until a cycle is found.
+
+`MyRow.serialize` and `MySearchIterator.serialize` accept the same `columns` and `depth` arguments.
+
+## Instrumentation
+
+### Overview
+Instrumentation records, per operation, the wall time, the number of calls made on the underlying Anvil tables, the number of rows converted to `MyRow` objects or serialized, and the deepest level of linked rows reached. It covers the public methods of `MyTable`, `MyRow`, `MySearchIterator` and `Serializer`. While disabled, the methods are not wrapped, so nothing is collected and nothing is slowed down. Operations that run inside another operation are also counted in the outer one.
+
+### `enable_instrumentation` / `disable_instrumentation` / `instrument`
+- **Purpose:** Turns collection on or off. `instrument()` is a context manager that enables it for the duration of the block.
+- **Example:**
+  ```python
+  with instrument():
+      employees.search(role="Engineer").serialize()
+  print(stats())
+  ```
+
+### `track`
+- **Purpose:** Groups everything inside the block under one named operation, such as a server call, so it can be logged per request.
+- **Example:**
+  ```python
+  @anvil.server.callable
+  def load_dashboard():
+      with track("load_dashboard"):
+          return employees.search(role="Engineer").serialize(depth=1)
+  ```
+
+### `add_hook` / `remove_hook`
+- **Purpose:** Registers a function that is called after every operation with a dictionary of `operation`, `wall_time`, `table_calls`, `rows_converted` and `max_depth`.
+- **Example:**
+  ```python
+  add_hook(lambda event: print(event["operation"], event["wall_time"]))
+  ```
+
+### `stats` / `reset_stats`
+- **Purpose:** `stats()` returns a snapshot of `enabled` and `operations`, which maps each operation name to its `calls`, total `wall_time`, `table_calls` and `rows_converted`, and the largest `max_depth`. `reset_stats()` clears the totals.
+
 These classes (`MyTable`, `MyRow`, and `MySearchIterator`) provide an extended interface for managing database operations in Anvil applications, streamlining the process of interacting with Anvil's built-in database capabilities and enhancing the user experience with Pythonic data manipulation techniques.
 """
 
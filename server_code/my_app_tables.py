@@ -1,55 +1,690 @@
-import anvil.tables as tables
-import anvil.tables.query as q
-from anvil.tables import app_tables
-from typing import List, Union
+from __future__ import annotations
+
+import asyncio
+import atexit
+import base64
+import collections
+import concurrent.futures
+import contextlib
+import csv
+import datetime
+import functools
+import io
+import itertools
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+import warnings
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional, Tuple, Union
 
 import anvil.server
-import anvil.tables as tables
-import anvil.tables.query as q
-from anvil._server import LiveObjectProxy
-from anvil.tables import Row, SearchIterator, Table, app_tables
+
+if TYPE_CHECKING:
+    from anvil.tables import Row, SearchIterator, Table
+
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_MAX_WORKERS = 8
+
+# --- DEFERRED IMPORTS ---
+
+# anvil.tables is imported on first use rather than when this module loads,
+# which keeps the cold start of server modules that import it short.
+
+
+def _tables():
+    import anvil.tables
+
+    return anvil.tables
+
+
+def _query():
+    import anvil.tables.query
+
+    return anvil.tables.query
+
+
+@functools.lru_cache(maxsize=None)
+def _anvil_types() -> tuple:
+    from anvil._server import LiveObjectProxy
+    from anvil.tables import Row, SearchIterator
+
+    return LiveObjectProxy, SearchIterator, Row
+
+
+# --- TRANSACTIONS ---
+
+
+class TransactionPolicy:
+    # How a table's writes run in transactions: conflicts are retried up to
+    # max_retries times with jittered exponential backoff, and at most
+    # max_concurrency transactions run at once. Nested calls join the
+    # enclosing transaction instead of opening and retrying their own.
+    def __init__(
+        self,
+        max_retries: int = 8,
+        base_delay: float = 0.05,
+        max_delay: float = 2.0,
+        max_concurrency: int = None,
+    ):
+        if max_retries < 0:
+            raise ValueError("max_retries cannot be negative.")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_concurrency = max_concurrency
+        self._semaphore = (
+            threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        )
+        self._lock = threading.Lock()
+        self.transactions = 0
+        self.commits = 0
+        self.conflicts = 0
+        self.retries = 0
+        self.aborts = 0
+        self.backoff_time = 0.0
+
+    # --- MAGIC METHODS ---
+
+    def __repr__(self):
+        return (
+            f"<TransactionPolicy: max_retries={self.max_retries} "
+            f"max_concurrency={self.max_concurrency}>"
+        )
+
+    # --- PRIVATE METHODS ---
+
+    def _count(self, counter: str, amount=1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    # --- PUBLIC METHODS ---
+
+    def backoff(self, attempt: int) -> float:
+        # "Full jitter": a random delay up to the exponential bound, so
+        # writers that conflicted together do not retry together
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def run(self, function: Callable, *args, **kwargs):
+        if getattr(_transaction_state, "depth", 0):
+            return function(*args, **kwargs)
+
+        tables = _tables()
+        self._count("transactions")
+        for attempt in itertools.count():
+            try:
+                with self._semaphore or contextlib.nullcontext():
+                    _transaction_state.depth = 1
+                    _transaction_state.committed = []
+                    try:
+                        with tables.Transaction():
+                            result = function(*args, **kwargs)
+                    finally:
+                        _transaction_state.depth = 0
+                        committed = _transaction_state.committed
+                        _transaction_state.committed = None
+            except tables.TransactionConflict:
+                self._count("conflicts")
+                if attempt >= self.max_retries:
+                    self._count("aborts")
+                    raise
+            except Exception:
+                self._count("aborts")
+                raise
+            else:
+                self._count("commits")
+                for callback in committed:
+                    callback()
+                return result
+
+            self._count("retries")
+            delay = self.backoff(attempt)
+            self._count("backoff_time", delay)
+            time.sleep(delay)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "transactions": self.transactions,
+                "commits": self.commits,
+                "conflicts": self.conflicts,
+                "retries": self.retries,
+                "aborts": self.aborts,
+                "backoff_time": self.backoff_time,
+            }
+
+
+# Whether the current thread is inside a policy's transaction
+_transaction_state = threading.local()
+
+# Used by rows that were not read through a MyTable
+_default_policy = TransactionPolicy()
+
+
+def _after_commit(callback: Callable[[], None]) -> None:
+    # Runs callback once the current policy transaction commits, so work
+    # done by a rolled-back attempt is never counted; outside one, at once
+    committed = getattr(_transaction_state, "committed", None)
+    if committed is None:
+        callback()
+    else:
+        committed.append(callback)
+
+
+def _in_transaction(function: Callable) -> Callable:
+    # Runs a MyTable or MyRow method under its transaction_policy
+    @functools.wraps(function)
+    def wrapper(owner, *args, **kwargs):
+        return owner.transaction_policy.run(function, owner, *args, **kwargs)
+
+    return wrapper
+
+
+# --- TYPE CLASSIFICATION ---
+
+KIND_VALUE = "value"
+KIND_ROW = "row"
+KIND_SEARCH = "search"
+KIND_LIVE_OBJECT = "live_object"
+KIND_LIST = "list"
+KIND_DICT = "dict"
+KIND_MY_ROW = "my_row"
+KIND_MY_SEARCH = "my_search"
+
+# LiveObjectProxy instances share one class, so they are classified per
+# backend (read from the proxy's spec) rather than per type.
+_KIND_PROXY = "proxy"
+
+_BACKEND_KINDS = {
+    "anvil.tables.Row": KIND_ROW,
+    "anvil.tables.SearchIterator": KIND_SEARCH,
+}
+
+_kinds_by_type = {}
+_kinds_by_backend = dict(_BACKEND_KINDS)
+
+
+def _classify_type(cls) -> str:
+    LiveObjectProxy, SearchIterator, Row = _anvil_types()
+    if issubclass(cls, MyRow):
+        return KIND_MY_ROW
+    elif issubclass(cls, MySearchIterator):
+        return KIND_MY_SEARCH
+    elif issubclass(cls, LiveObjectProxy):
+        return _KIND_PROXY
+    elif issubclass(cls, SearchIterator):
+        return KIND_SEARCH
+    elif issubclass(cls, Row):
+        return KIND_ROW
+    elif issubclass(cls, list):
+        return KIND_LIST
+    elif issubclass(cls, dict):
+        return KIND_DICT
+    else:
+        return KIND_VALUE
+
+
+def _classify_proxy(value) -> str:
+    spec = getattr(value, "_spec", None)
+    backend = spec.get("backend") if isinstance(spec, dict) else None
+    if backend is None:
+        # No spec to go on; fall back to the proxy's repr, uncached
+        value_str = str(value)
+        for name, kind in _BACKEND_KINDS.items():
+            if f"<LiveObject: {name}>" in value_str:
+                return kind
+        return KIND_LIVE_OBJECT
+
+    kind = _kinds_by_backend.get(backend)
+    if kind is None:
+        kind = _kinds_by_backend[backend] = KIND_LIVE_OBJECT
+    return kind
+
+
+def _classify(value) -> str:
+    cls = type(value)
+    kind = _kinds_by_type.get(cls)
+    if kind is None:
+        kind = _kinds_by_type[cls] = _classify_type(cls)
+
+    if kind is _KIND_PROXY:
+        return _classify_proxy(value)
+    return kind
 
 
 class Serializer:
+    def __init__(self, columns: Iterable[str] = None, depth: int = None):
+        # columns may use dotted names ("customer.name") to project linked
+        # rows; depth limits how many levels of links are expanded.
+        self.columns = list(columns) if columns is not None else None
+        self.depth = depth
+        self._projection = _parse_projection(self.columns)
+
     def to_anvil(self, data):
-        if isinstance(data, MyRow):
-            # Convert MyRow to an anvil.tables.Row
-            return data.get_anvil_row()
-        elif isinstance(data, MySearchIterator):
-            # Convert MySearchIterator to an anvil.tables.SearchIterator
-            return data.get_anvil_search()
-        elif isinstance(data, list):
-            # Convert each MyRow in the list
-            return [self.to_anvil(row) for row in data]
-        elif isinstance(data, dict):
-            # Convert each value in the dictionary
-            return {key: self.to_anvil(value) for key, value in data.items()}
-        else:
-            # Handle non-MyRow data
-            return data
+        convert = _TO_ANVIL.get(_classify(data))
+        return convert(self, data) if convert is not None else data
 
     def serialize(self, data):
-        if isinstance(data, (Row, LiveObjectProxy)):
-            # Convert Row to a dictionary, handling nested Row objects recursively
+        # Walks the data with an explicit stack rather than recursion, so
+        # deeply linked rows cannot exhaust the interpreter's stack.
+        result = [None]
+        stack = [(data, result, 0, 0, self._projection, frozenset())]
+        while stack:
+            value, container, slot, depth, projection, path = stack.pop()
+            visit = _SERIALIZERS.get(_classify(value))
+            if visit is None:
+                container[slot] = value
+            else:
+                visit(self, stack, value, container, slot, depth, projection, path)
+
+        return result[0]
+
+    # --- PRIVATE METHODS ---
+
+    def _visit_row(self, stack, row, container, slot, depth, projection, path):
+        row_id = _row_id(row)
+        if row_id in path or (self.depth is not None and depth > self.depth):
+            # Cycles and links beyond the requested depth are emitted as ids
+            container[slot] = row_id
+            return
+
+        # Each cell is read exactly once, and only projected cells are read
+        if projection is None:
+            cells = dict(row)
+        else:
+            cells = {key: row[key] for key in projection}
+
+        serialized = {}
+        container[slot] = serialized
+        path = path | {row_id}
+        for key, value in cells.items():
+            if _classify(value) in _NESTED_KINDS:
+                serialized[key] = None
+                child_projection = projection.get(key) if projection else None
+                stack.append(
+                    (value, serialized, key, depth + 1, child_projection, path)
+                )
+            else:
+                serialized[key] = value
+
+    def _visit_rows(self, stack, rows, container, slot, depth, projection, path):
+        rows = list(rows)
+        serialized = [None] * len(rows)
+        container[slot] = serialized
+        for index in reversed(range(len(rows))):
+            stack.append((rows[index], serialized, index, depth, projection, path))
+
+    def _visit_wrapped(self, stack, data, container, slot, depth, projection, path):
+        data = data.get_anvil_row() if isinstance(data, MyRow) else data.search
+        stack.append((data, container, slot, depth, projection, path))
+
+
+def _parse_projection(columns: Optional[List[str]]) -> Optional[dict]:
+    # ["name", "customer.name"] -> {"name": None, "customer": {"name": None}},
+    # where None means every column.
+    if columns is None:
+        return None
+
+    projection = {}
+    for column in columns:
+        node = projection
+        parts = column.split(".")
+        for part in parts[:-1]:
+            child = node.get(part, {})
+            if child is None:
+                break
+            node = node.setdefault(part, child)
+        else:
+            node[parts[-1]] = None
+
+    return projection
+
+
+def _row_id(row):
+    try:
+        return row.get_id()
+    except Exception:
+        return id(row)
+
+
+WIRE_FORMAT = "columnar"
+WIRE_VERSION = 1
+
+# How a column's values are written: as they are, as a linked row's id, or
+# as a list of linked rows' ids
+WIRE_VALUE = "value"
+WIRE_LINK = "link"
+WIRE_LINKS = "links"
+
+
+def _wire_kind(values) -> str:
+    kind = WIRE_VALUE
+    for value in values:
+        value_kind = _classify(value)
+        if value_kind in (KIND_ROW, KIND_LIVE_OBJECT):
+            return WIRE_LINK
+        if value_kind == KIND_LIST and any(
+            _classify(item) in (KIND_ROW, KIND_LIVE_OBJECT) for item in value
+        ):
+            kind = WIRE_LINKS
+    return kind
+
+
+def _wire_value(kind: str, value):
+    if value is None or kind == WIRE_VALUE:
+        return value
+    if kind == WIRE_LINK:
+        return _row_id(value)
+    return [_row_id(item) for item in value]
+
+
+class ColumnarEncoder:
+    # Encodes rows for client forms without repeating what the client
+    # already has: column names are sent once per page, values as one list
+    # per column, repeated strings as codes into a per-column dictionary,
+    # and linked rows once each in a table keyed by row id. With delta=True
+    # the dictionaries and linked rows sent in earlier pages are not sent
+    # again; client_code/columnar.py decodes the payloads.
+    def __init__(self, columns: Iterable[str] = None, depth: int = 1, delta: bool = False):
+        self.columns = list(columns) if columns is not None else None
+        self.depth = depth
+        self.delta = delta
+        self._projection = _parse_projection(self.columns)
+        self.reset()
+
+    # --- PRIVATE METHODS ---
+
+    def _read(self, row, projection: Optional[dict]) -> dict:
+        if projection is None:
+            return dict(row)
+        return {key: row[key] for key in projection}
+
+    def _encode_column(self, column: str, values: list) -> dict:
+        dictionary = self._dictionaries.get(column)
+        if dictionary is None:
+            if not all(value is None or isinstance(value, str) for value in values):
+                return {"values": values}
+            strings = {value for value in values if value is not None}
+            if not strings:
+                return {"values": values}
+            if len(strings) > len(values) // 2:
+                # Mostly distinct strings gain nothing from a dictionary
+                return {"values": values}
+            dictionary = self._dictionaries[column] = {}
+        elif not all(value is None or isinstance(value, str) for value in values):
+            return {"values": values}
+
+        added = []
+        codes = []
+        for value in values:
+            if value is None:
+                codes.append(None)
+                continue
+            code = dictionary.get(value)
+            if code is None:
+                code = dictionary[value] = len(dictionary)
+                added.append(value)
+            codes.append(code)
+        return {"dict": added, "codes": codes}
+
+    def _schema_index(self, columns: list, kinds: list, schemas: list) -> int:
+        key = (tuple(columns), tuple(kinds))
+        index = self._schemas.get(key)
+        if index is None:
+            index = self._schemas[key] = len(self._schemas)
+            schemas.append([list(columns), list(kinds)])
+        return index
+
+    def _encode_links(self, pending: list, schemas: list) -> dict:
+        # Breadth-first over linked rows, each sent once; rows beyond depth
+        # stay ids that the client cannot expand
+        links = {}
+        pending = collections.deque(pending)
+        while pending:
+            row, level, projection = pending.popleft()
+            row_id = _row_id(row)
+            if row_id in self._sent or (self.depth is not None and level > self.depth):
+                continue
+            self._sent.add(row_id)
+
+            cells = self._read(row, projection)
+            columns = list(cells)
+            kinds = [_wire_kind([value]) for value in cells.values()]
+            values = [
+                _wire_value(kind, value) for kind, value in zip(kinds, cells.values())
+            ]
+            links[row_id] = [self._schema_index(columns, kinds, schemas), values]
+
+            for column, kind, value in zip(columns, kinds, cells.values()):
+                if kind == WIRE_VALUE or value is None:
+                    continue
+                child = projection.get(column) if projection else None
+                for linked in [value] if kind == WIRE_LINK else value:
+                    pending.append((linked, level + 1, child))
+        return links
+
+    # --- PUBLIC METHODS ---
+
+    def reset(self) -> None:
+        self._dictionaries = {}
+        self._schemas = {}
+        self._sent = set()
+        self._page = -1
+
+    def encode(self, rows: Iterable) -> dict:
+        if not self.delta:
+            self.reset()
+        self._page += 1
+
+        serializer = Serializer()
+        rows = [serializer.to_anvil(row) for row in rows]
+        cells = [self._read(row, self._projection) for row in rows]
+        if self._projection is not None:
+            columns = list(self._projection)
+        else:
+            columns = list(dict.fromkeys(key for row in cells for key in row))
+
+        kinds, data, pending, schemas = [], [], [], []
+        for column in columns:
+            values = [row.get(column) for row in cells]
+            kind = _wire_kind(values)
+            kinds.append(kind)
+            if kind == WIRE_VALUE:
+                data.append(self._encode_column(column, values))
+                continue
+
+            data.append({"values": [_wire_value(kind, value) for value in values]})
+            child = self._projection.get(column) if self._projection else None
+            for value in values:
+                if value is not None:
+                    for linked in [value] if kind == WIRE_LINK else value:
+                        pending.append((linked, 1, child))
+
+        return {
+            "format": WIRE_FORMAT,
+            "version": WIRE_VERSION,
+            "page": self._page,
+            "delta": self.delta,
+            "count": len(rows),
+            "ids": [_row_id(row) for row in rows],
+            "columns": columns,
+            "kinds": kinds,
+            "data": data,
+            "schemas": schemas,
+            "links": self._encode_links(pending, schemas),
+        }
+
+
+_TO_ANVIL = {
+    # Convert MyRow to an anvil.tables.Row
+    KIND_MY_ROW: lambda serializer, data: data.get_anvil_row(),
+    # Convert MySearchIterator to an anvil.tables.SearchIterator
+    KIND_MY_SEARCH: lambda serializer, data: data.get_anvil_search(),
+    # Convert each MyRow in the list
+    KIND_LIST: lambda serializer, data: [serializer.to_anvil(row) for row in data],
+    # Convert each value in the dictionary
+    KIND_DICT: lambda serializer, data: {
+        key: serializer.to_anvil(value) for key, value in data.items()
+    },
+}
+
+_SERIALIZERS = {
+    KIND_ROW: Serializer._visit_row,
+    KIND_LIVE_OBJECT: Serializer._visit_row,
+    KIND_SEARCH: Serializer._visit_rows,
+    KIND_LIST: Serializer._visit_rows,
+    KIND_MY_ROW: Serializer._visit_wrapped,
+    KIND_MY_SEARCH: Serializer._visit_wrapped,
+}
+
+_NESTED_KINDS = frozenset(_SERIALIZERS)
+
+
+class Schema:
+    # Column names and types of one table, held once and shared by every
+    # MyRow read through it; rows store their values by position.
+    __slots__ = ("columns", "types", "index")
+
+    def __init__(self, columns: list):
+        self.columns = tuple(column["name"] for column in columns)
+        self.types = tuple(column["type"] for column in columns)
+        self.index = {name: position for position, name in enumerate(self.columns)}
+
+    def __repr__(self):
+        return f"<Schema: {', '.join(self.columns)}>"
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __contains__(self, column):
+        return column in self.index
+
+
+# Marks a position in MyRow._values that has not been converted yet
+_UNSET = object()
+
+# Returned by a column change that leaves the column as it is
+_UNCHANGED = object()
+
+
+def _editable(value) -> bool:
+    # Whether a loaded value shares lists or dicts with the converted value
+    # MyRow hands out; lists are converted into new lists, dicts are not
+    if isinstance(value, dict):
+        return True
+    return isinstance(value, list) and any(
+        isinstance(item, (list, dict)) for item in value
+    )
+
+
+def _snapshot_value(value):
+    # Copies the lists and dicts of a value as it was loaded, so edits made
+    # to it in place afterwards still show up as changes
+    if isinstance(value, list):
+        return [_snapshot_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _snapshot_value(item) for key, item in value.items()}
+    return value
+
+
+def _same(current, value) -> bool:
+    # Values of different types are always written, so that 1 -> True or
+    # 1 -> 1.0 still reaches the database
+    if current is value:
+        # A list or dict may have been edited in place since it was read
+        return not isinstance(value, (list, dict))
+    try:
+        return type(current) is type(value) and bool(current == value)
+    except Exception:
+        return False
+
+
+def _changed_columns(
+    row: Row, kwargs: dict, snapshot: Optional[Callable[[str], object]] = None
+) -> dict:
+    # The columns of kwargs whose values differ from the row's loaded ones,
+    # taken from snapshot(column) unless it returns _UNSET
+    changes = {}
+    for column, value in kwargs.items():
+        loaded = snapshot(column) if snapshot is not None else _UNSET
+        if loaded is not _UNSET:
+            if not _same(loaded, value):
+                changes[column] = value
+            continue
+        try:
+            current = row[column]
+        except Exception:
+            # Unknown columns are left for the write to report
+            changes[column] = value
+            continue
+        if not _same(current, value):
+            changes[column] = value
+    return changes
+
+
+class WriteCounters:
+    # Counts the row writes made and avoided by dirty-field tracking
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.writes = 0
+        self.skipped_writes = 0
+        self.columns_written = 0
+        self.columns_skipped = 0
+
+    def record_write(self, columns: int) -> None:
+        with self._lock:
+            self.writes += 1
+            self.columns_written += columns
+
+    def record_skip(self, columns: int, whole_write: bool) -> None:
+        with self._lock:
+            self.columns_skipped += columns
+            if whole_write:
+                self.skipped_writes += 1
+
+    def stats(self) -> dict:
+        with self._lock:
             return {
-                key: self.serialize(data[key])
-                if isinstance(data[key], (Row, SearchIterator, list))
-                else data[key]
-                for key in data.keys()
+                "writes": self.writes,
+                "skipped_writes": self.skipped_writes,
+                "columns_written": self.columns_written,
+                "columns_skipped": self.columns_skipped,
             }
-        elif isinstance(data, (SearchIterator, list)):
-            # Convert each Row in the SearchIterator or list
-            return [self.serialize(row) for row in data]
-        elif isinstance(data, (MyRow, MySearchIterator)):
-            # Convert MyRow or MySearchIterator to a dictionary
-            return self.serialize(data.get_anvil_row())
-        else:
-            # Handle non-Row data
-            return data
+
+
+# Used by rows that were not read through a MyTable
+_default_write_counters = WriteCounters()
 
 
 class MyRow:
-    def __init__(self, row: Row):
+    __slots__ = (
+        "_row",
+        "_eager",
+        "_table",
+        "_schema",
+        "_values",
+        "_snapshot",
+        "_pending",
+        "_batch_depth",
+    )
+
+    def __init__(self, row: Row, eager: bool = False, table: "MyTable" = None):
+        self._eager = eager
+        # The MyTable this row was read through, used to invalidate its cache
+        self._table = table
+        # Column edits collected while inside batch(); None outside a batch
+        self._pending = None
+        self._batch_depth = 0
         self.row = row
 
     # --- PROPERTIES ---
@@ -61,13 +696,45 @@ class MyRow:
     @row.setter
     def row(self, value: Row):
         self._row = value
-        self._converted_row = self._convert_nested_rows(value)
+        # Columns are converted on first access by __getitem__; the storage
+        # and the table's schema are only looked up then
+        self._schema = None
+        self._values = None
+        # Copies of the columns MyRow hands out editable lists or dicts
+        # for, as read, which writes are diffed against; stored like _values
+        self._snapshot = None
+        if self._eager:
+            for key, converted in self._convert_nested_rows(value).items():
+                self._store(key, converted)
+
+    @property
+    def eager(self) -> bool:
+        return self._eager
+
+    @property
+    def schema(self) -> Optional[Schema]:
+        return self._schema
+
+    @property
+    def pending(self) -> dict:
+        return dict(self._pending or {})
+
+    @property
+    def transaction_policy(self) -> TransactionPolicy:
+        if self._table is not None:
+            return self._table.transaction_policy
+        return _default_policy
+
+    @property
+    def write_counters(self) -> WriteCounters:
+        if self._table is not None:
+            return self._table.write_counters
+        return _default_write_counters
 
     # --- MAGIC METHODS ---
 
     def __repr__(self):
-        row_str = str(self.row)
-        if "<LiveObject: anvil.tables.Row>" in row_str:
+        if _classify(self.row) == KIND_ROW and isinstance(self.row, _anvil_types()[0]):
             items = list(dict(self.row).items())
             repr_items = []
 
@@ -81,7 +748,8 @@ class MyRow:
             if len(items) > 2:
                 repr_str += f", plus {len(items) - 2} more columns"
         else:
-            repr_str = row_str.replace("<anvil.tables.Row: ", "").replace(">", "")
+            repr_str = str(self.row)
+            repr_str = repr_str.replace("<anvil.tables.Row: ", "").replace(">", "")
 
         return f"<MyRow: {repr_str}>"
 
@@ -89,13 +757,98 @@ class MyRow:
         self.update(**{key: value})
 
     def __getitem__(self, key):
-        try:
-            return self._converted_row[key]
-        except Exception:
-            return self.row[key]
+        if self._pending and key in self._pending:
+            return self._convert_column(self._pending[key])
+
+        value = self._cached(key)
+        if value is _UNSET:
+            loaded = self.row[key]
+            value = self._convert_column(loaded)
+            self._store(key, value)
+            if _editable(loaded):
+                self._remember(key, _snapshot_value(loaded))
+        return value
 
     # --- PRIVATE METHODS ---
 
+    def _cached(self, key):
+        values = self._values
+        if values is None:
+            return _UNSET
+        if self._schema is None:
+            return values.get(key, _UNSET)
+
+        position = self._schema.index.get(key)
+        return _UNSET if position is None else values[position]
+
+    def _store(self, key, value) -> None:
+        if self._values is None:
+            # Rows of a table share its schema and store values by position;
+            # rows without one (such as linked rows) use a dict instead
+            if self._table is not None:
+                self._schema = self._table.schema
+                self._values = [_UNSET] * len(self._schema)
+            else:
+                self._values = {}
+
+        if self._schema is None:
+            self._values[key] = value
+            return
+
+        position = self._schema.index.get(key)
+        if position is None:
+            # A column added since the schema was read; left uncached until
+            # the table's schema is refreshed
+            return
+        self._values[position] = value
+
+    def _remember(self, key, value) -> None:
+        # Called after _store, so the storage layout is already chosen
+        if self._schema is None:
+            if self._snapshot is None:
+                self._snapshot = {}
+            self._snapshot[key] = value
+            return
+
+        position = self._schema.index.get(key)
+        if position is None:
+            return
+        if self._snapshot is None:
+            self._snapshot = [_UNSET] * len(self._schema)
+        self._snapshot[position] = value
+
+    def _loaded(self, key):
+        # The snapshot of a column, or _UNSET
+        snapshot = self._snapshot
+        if snapshot is None:
+            return _UNSET
+        if self._schema is None:
+            return snapshot.get(key, _UNSET)
+
+        position = self._schema.index.get(key)
+        return _UNSET if position is None else snapshot[position]
+
+    def _forget(self, key) -> None:
+        if self._values is None:
+            return
+        if self._schema is None:
+            self._values.pop(key, None)
+            if self._snapshot is not None:
+                self._snapshot.pop(key, None)
+            return
+
+        position = self._schema.index.get(key)
+        if position is not None:
+            self._values[position] = _UNSET
+            if self._snapshot is not None:
+                self._snapshot[position] = _UNSET
+
+    def _convert_column(self, value):
+        # Lazy counterpart of _process_value: linked rows are wrapped without
+        # being read, so they are only fetched when dereferenced.
+        convert = _LAZY_CONVERTERS.get(_classify(value))
+        return convert(self, value) if convert is not None else value
+
     def _convert_nested_rows(self, row, processed_objects=None):
         if processed_objects is None:
             processed_objects = set()
@@ -106,9 +859,10 @@ class MyRow:
             return row  # Return the original row to avoid infinite recursion
         processed_objects.add(row_id)
 
-        if isinstance(row, (Row, LiveObjectProxy)):
-            row_dict = {key: row[key] for key in row.keys()}
-        elif isinstance(row, dict):
+        kind = _classify(row)
+        if kind in (KIND_ROW, KIND_LIVE_OBJECT):
+            row_dict = dict(row)
+        elif kind == KIND_DICT:
             row_dict = row
         else:
             return row  # Base case for non-dict and non-Row types
@@ -125,108 +879,237 @@ class MyRow:
         return converted_row
 
     def _process_value(self, value, processed_objects):
-        if isinstance(value, (MyRow, MySearchIterator)):
-            return value
-        elif isinstance(value, SearchIterator):
-            return MySearchIterator(value)
-        elif isinstance(value, list):
-            return [
-                self._convert_nested_rows(item, processed_objects)
-                for item in value
-                if id(item) not in processed_objects
-            ]
-        elif isinstance(value, (Row, LiveObjectProxy)):
-            return self._convert_live_object_proxy(value, processed_objects)
-        else:
+        convert = _EAGER_CONVERTERS.get(_classify(value))
+        if convert is None:
             return value
+        return convert(self, value, processed_objects)
 
-    def _convert_live_object_proxy(self, value, processed_objects):
-        if "<LiveObject: anvil.tables.Row>" in str(value):
-            return MyRow(value)
-        elif "<LiveObject: anvil.tables.SearchIterator>" in str(value):
-            return MySearchIterator(value)
-        else:
-            return self._convert_nested_rows(value, processed_objects)
+    def _current(self, column: str):
+        # Reads a column as it will be written, including deferred edits
+        if self._pending and column in self._pending:
+            return self._pending[column]
+        return self.row[column]
+
+    def _write(self, kwargs: dict) -> None:
+        self.row.update(**kwargs)
+        counters, columns = self.write_counters, len(kwargs)
+        _after_commit(lambda: counters.record_write(columns))
+        for key in kwargs:
+            self._forget(key)
+
+        if self._table is not None:
+            self._table._invalidate(self.row)
+
+    def _diff(self, kwargs: dict) -> dict:
+        # Drops the columns whose values would not change, counting them
+        changes = _changed_columns(self.row, kwargs, self._loaded)
+        if len(changes) < len(kwargs):
+            self.write_counters.record_skip(len(kwargs) - len(changes), not changes)
+        return changes
+
+    def _change_column(self, column: str, change: Callable) -> None:
+        # Applies change(current value) -> new value. Outside a batch the
+        # column is read again inside the transaction, so when a conflict
+        # is retried the change is re-applied to the latest value.
+        if self._pending is not None:
+            value = change(self._current(column))
+            if value is not _UNCHANGED:
+                self.update(**{column: value})
+            return
+
+        # Changes that would leave the loaded value as it is skip the
+        # transaction altogether
+        current = self.row[column]
+        value = change(current)
+        if value is _UNCHANGED or not _changed_columns(
+            self.row, {column: Serializer().to_anvil(value)}, self._loaded
+        ):
+            self.write_counters.record_skip(1, True)
+            return
+
+        self._commit_change(column, change)
 
     # --- PUBLIC METHODS (in_transaction) ---
 
-    @tables.in_transaction
+    @_in_transaction
+    def _commit(self, kwargs: dict) -> None:
+        self._write(kwargs)
+
+    @_in_transaction
+    def _commit_change(self, column: str, change: Callable) -> None:
+        kwargs = {column: change(self.row[column])}
+        if kwargs[column] is not _UNCHANGED:
+            kwargs = self._diff(Serializer().to_anvil(kwargs))
+            if kwargs:
+                self._write(kwargs)
+
     def update(self, **kwargs) -> None:
         serializer = Serializer()
         kwargs = serializer.to_anvil(kwargs)
 
-        self.row.update(**kwargs)
+        if self._pending is not None:
+            self._pending.update(kwargs)
+            return
+
+        kwargs = self._diff(kwargs)
+        if kwargs:
+            self._commit(kwargs)
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+
+        kwargs = self._diff(self._pending)
+        if kwargs:
+            self._commit(kwargs)
+        self._pending = {} if self._batch_depth else None
+
+    @contextlib.contextmanager
+    def batch(self):
+        self._batch_depth += 1
+        if self._pending is None:
+            self._pending = {}
+
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._pending = None
+            raise
+
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            try:
+                self.flush()
+            finally:
+                self._pending = None
 
     # --- PUBLIC METHODS ---
 
     def delete(self):
+        if self._table is not None:
+            self._table._invalidate(self.row)
         return self.row.delete()
 
     def get(self, key: str, default=None):
         try:
-            return self.row[key]
+            return self._current(key)
         except KeyError:
             return default
 
     def add_to_list_column(self, column: str, value):
-        current_list = self.row[column] or []
-        if value not in current_list:
+        def change(current):
+            current_list = list(current or [])
+            if value in current_list:
+                return _UNCHANGED
             current_list.append(value)
-            self.update(**{column: current_list})
+            return current_list
+
+        self._change_column(column, change)
 
     def remove_from_list_column(self, column: str, value):
-        current_list = self.row[column] or []
-        if value in current_list:
+        def change(current):
+            current_list = list(current or [])
+            if value not in current_list:
+                return _UNCHANGED
             current_list.remove(value)
-            self.update(**{column: current_list})
+            return current_list
+
+        self._change_column(column, change)
 
     def add_to_dict_column(self, column: str, key, value):
-        current_dict = self.row[column] or {}
-        current_dict[key] = value
-        self.update(**{column: current_dict})
+        def change(current):
+            current_dict = dict(current or {})
+            current_dict[key] = value
+            return current_dict
+
+        self._change_column(column, change)
 
     def remove_from_dict_column(self, column: str, key):
-        current_dict = self.row[column] or {}
-        if key in current_dict:
+        def change(current):
+            current_dict = dict(current or {})
+            if key not in current_dict:
+                return _UNCHANGED
             del current_dict[key]
-            self.update(**{column: current_dict})
+            return current_dict
+
+        self._change_column(column, change)
 
     def update_simple_object_column(self, column: str, data: Union[dict, list]):
-        current_column = self.row[column]
-        if not current_column:
-            if isinstance(data, (dict, list)):
-                self.row[column] = data
-            else:
+        def change(current_column):
+            if not current_column:
+                if isinstance(data, (dict, list)):
+                    return data
                 raise TypeError(
                     f"Unsupported data type {type(data)} for column {column}."
                 )
-        elif isinstance(current_column, type(data)):
-            if isinstance(data, dict):
-                for key, value in data.items():
-                    self.add_to_dict_column(column, key, value)
-            elif isinstance(data, list):
-                self.add_to_list_column(column, data)
+            elif isinstance(current_column, type(data)):
+                if isinstance(data, dict):
+                    return {**current_column, **data}
+                elif isinstance(data, list):
+                    if data in current_column:
+                        return _UNCHANGED
+                    return list(current_column) + [data]
+                else:
+                    raise TypeError(
+                        f"Unsupported data type {type(data)} for column {column}."
+                    )
             else:
                 raise TypeError(
-                    f"Unsupported data type {type(data)} for column {column}."
+                    f"Data type mismatch: cannot update column {column} of type {type(current_column)} with value {data} of type {type(data)}."
                 )
-        else:
-            raise TypeError(
-                f"Data type mismatch: cannot update column {column} of type {type(current_column)} with value {data} of type {type(data)}."
-            )
+
+        self._change_column(column, change)
 
     def get_anvil_row(self):
         return self.row
 
     # --- SERIALIZATION ---
 
-    def serialize(self):
-        serilizer = Serializer()
+    def serialize(self, columns: Iterable[str] = None, depth: int = None) -> dict:
+        serilizer = Serializer(columns=columns, depth=depth)
         return serilizer.serialize(self.row)
 
 
+_LAZY_CONVERTERS = {
+    KIND_SEARCH: lambda row, value: MySearchIterator(value),
+    KIND_LIST: lambda row, value: [row._convert_column(item) for item in value],
+    KIND_ROW: lambda row, value: MyRow(value),
+    KIND_LIVE_OBJECT: lambda row, value: MyRow(value),
+}
+
+_EAGER_CONVERTERS = {
+    KIND_SEARCH: lambda row, value, seen: MySearchIterator(value),
+    KIND_LIST: lambda row, value, seen: [
+        row._convert_nested_rows(item, seen) for item in value if id(item) not in seen
+    ],
+    KIND_ROW: lambda row, value, seen: MyRow(value, eager=True),
+    KIND_LIVE_OBJECT: lambda row, value, seen: row._convert_nested_rows(value, seen),
+}
+
+
 class MySearchIterator:
-    def __init__(self, search: SearchIterator):
+    def __init__(
+        self,
+        search: SearchIterator,
+        eager: bool = False,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch_pages: int = 0,
+        table: "MyTable" = None,
+        prefetch: Iterable[str] = None,
+    ):
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1.")
+        if prefetch_pages < 0:
+            raise ValueError("prefetch_pages cannot be negative.")
+
+        self._eager = eager
+        self._page_size = page_size
+        self._prefetch_pages = prefetch_pages
+        self._table = table
+        # Link paths ("customer", "items.product") resolved once per page
+        self._prefetch = list(prefetch or [])
         self.search = search
 
     # --- PROPERTIES ---
@@ -237,8 +1120,24 @@ class MySearchIterator:
 
     @search.setter
     def search(self, value: SearchIterator):
-        self._anvil_search = value
-        self._search = self._convert_rows(value)
+        self._search = value
+        # Only the most recently indexed page is kept, so memory stays bounded
+        # by page_size regardless of how many rows the search returns.
+        self._page_index = None
+        self._page = []
+        self._iterator = None
+
+    @property
+    def page_size(self) -> int:
+        return self._page_size
+
+    @property
+    def prefetch_pages(self) -> int:
+        return self._prefetch_pages
+
+    @property
+    def prefetch(self) -> List[str]:
+        return list(self._prefetch)
 
     # --- MAGIC METHODS ---
 
@@ -246,48 +1145,1214 @@ class MySearchIterator:
         return f"<MySearchIterator: {self.search}>"
 
     def __iter__(self):
-        return self.search.__iter__()
+        pages = self._iter_pages()
+        if self._prefetch_pages:
+            pages = _prefetch_pages(pages, self._prefetch_pages)
+
+        for page in pages:
+            yield from page
 
     def __next__(self):
-        return self.search.__next__()
+        if self._iterator is None:
+            self._iterator = iter(self)
+        return next(self._iterator)
 
     def __getitem__(self, key):
-        return self.search[key]
+        if isinstance(key, slice):
+            return MySearchIterator(
+                self.search[key],
+                eager=self._eager,
+                page_size=self._page_size,
+                prefetch_pages=self._prefetch_pages,
+                table=self._table,
+                prefetch=self._prefetch,
+            )
+
+        if key < 0:
+            key += len(self)
+        if key < 0:
+            raise IndexError("MySearchIterator index out of range")
+
+        page_index, offset = divmod(key, self._page_size)
+        page = self._get_page(page_index)
+        if offset >= len(page):
+            raise IndexError("MySearchIterator index out of range")
+
+        return page[offset]
 
     def __len__(self):
-        return self.search.__len__()
+        return len(self.search)
 
     # --- PRIVATE METHODS ---
 
-    def _convert_rows(self, search: SearchIterator) -> List[MyRow]:
-        converted_rows = [MyRow(row) for row in search]
-        return converted_rows
+    def _convert_rows(self, rows) -> List[MyRow]:
+        converted = [MyRow(row, eager=self._eager, table=self._table) for row in rows]
+        if self._prefetch:
+            _prefetch_links(converted, self._prefetch)
+        return converted
+
+    def _iter_pages(self):
+        rows = iter(self.search)
+        while True:
+            page = self._convert_rows(itertools.islice(rows, self._page_size))
+            if not page:
+                return
+            yield page
+
+    def _get_page(self, page_index: int) -> List[MyRow]:
+        if page_index != self._page_index:
+            start = page_index * self._page_size
+            self._page = self._convert_rows(
+                self.search[start : start + self._page_size]
+            )
+            self._page_index = page_index
+
+        return self._page
 
     # --- PUBLIC METHODS ---
 
     def get_index(self, index: int, return_anvil: bool = False) -> MyRow:
-        if index >= len(self.search):
+        if index >= len(self):
             return None
 
         if return_anvil:
             return self.search[index]
 
-        return MyRow(self.search[index])
+        return self[index]
 
     def get_anvil_search(self):
-        return getattr(self, "_anvil_search", [])
+        return self.search
 
     # --- SERIALIZATION ---
 
-    def serialize(self):
-        serilizer = Serializer()
+    def serialize(
+        self, columns: Iterable[str] = None, depth: int = None
+    ) -> List[dict]:
+        serilizer = Serializer(columns=columns, depth=depth)
         return serilizer.serialize(self.search)
 
+    def serialize_columnar(self, columns: Iterable[str] = None, depth: int = 1) -> dict:
+        encoder = ColumnarEncoder(columns=columns, depth=depth)
+        return encoder.encode(self.search)
+
+    def serialize_columnar_pages(
+        self, columns: Iterable[str] = None, depth: int = 1, delta: bool = True
+    ):
+        # One payload per page_size rows; with delta, later pages omit the
+        # linked rows and dictionary entries of earlier ones
+        encoder = ColumnarEncoder(columns=columns, depth=depth, delta=delta)
+        rows = iter(self.search)
+        while True:
+            page = list(itertools.islice(rows, self._page_size))
+            if not page:
+                return
+            yield encoder.encode(page)
+
+    # --- COLUMNAR ---
+
+    def _column_names(self, columns: Optional[Iterable[str]]) -> List[str]:
+        if columns is not None:
+            return [columns] if isinstance(columns, str) else list(columns)
+        if self._table is not None:
+            return list(self._table.schema.columns)
+
+        for row in self.search[:1]:
+            return list(dict(row))
+        return []
+
+    def _iter_column_pages(self, columns: List[str]):
+        # Reads one page of Anvil rows at a time straight into per-column
+        # lists, without wrapping any of them in MyRow
+        def pages():
+            rows = iter(self.search)
+            while True:
+                page = list(itertools.islice(rows, self._page_size))
+                if not page:
+                    return
+                yield {
+                    column: [_column_value(row[column]) for row in page]
+                    for column in columns
+                }
+
+        if self._prefetch_pages:
+            return _prefetch_pages(pages(), self._prefetch_pages)
+        return pages()
+
+    def to_columns(self, columns: Iterable[str] = None) -> dict:
+        np = _require_numpy("to_columns")
+        columns = self._column_names(columns)
+        types = {}
+        if self._table is not None:
+            schema = self._table.schema
+            types = {
+                column: schema.types[schema.index[column]]
+                for column in columns
+                if column in schema
+            }
+
+        # Columns without a schema are read as object arrays and their type is
+        # inferred across every page, so one page of only None (or only
+        # numbers) cannot decide it for the rest of the column
+        inferred = {column: None for column in columns if column not in types}
+        chunks = {column: [] for column in columns}
+        for page in self._iter_column_pages(columns):
+            for column, values in page.items():
+                if column in inferred:
+                    if inferred[column] != "object":
+                        inferred[column] = _infer_type(values, inferred[column])
+                    chunks[column].append(_object_array(np, values))
+                else:
+                    chunks[column].append(_to_array(np, values, types[column]))
+
+        result = {}
+        for column, arrays in chunks.items():
+            array = np.concatenate(arrays) if arrays else np.empty(0, dtype=object)
+            if inferred.get(column) == "number":
+                array = _as_numbers(np, array)
+            result[column] = array
+        return result
+
+    def aggregate(
+        self,
+        group_by: Union[str, Iterable[str]] = None,
+        sum: Union[str, Iterable[str]] = None,
+        count: bool = True,
+    ) -> dict:
+        np = _require_numpy("aggregate")
+        group_by = self._column_names(group_by or [])
+        sums = self._column_names(sum or [])
+
+        # Running totals per group, merged page by page so only one page of
+        # values is held at a time
+        groups = {}
+        counts = np.zeros(0, dtype=np.int64)
+        totals = {column: np.zeros(0) for column in sums}
+
+        for page in self._iter_column_pages(list(dict.fromkeys(group_by + sums))):
+            size = len(next(iter(page.values())))
+            codes, keys = _group_codes(np, [page[column] for column in group_by], size)
+            positions = np.array(
+                [groups.setdefault(key, len(groups)) for key in keys], dtype=np.intp
+            )
+            rows = positions[codes]
+
+            grow = len(groups) - len(counts)
+            if grow:
+                counts = np.concatenate([counts, np.zeros(grow, dtype=np.int64)])
+                for column in sums:
+                    totals[column] = np.concatenate([totals[column], np.zeros(grow)])
+
+            counts += np.bincount(rows, minlength=len(groups))
+            for column in sums:
+                weights = np.nan_to_num(np.array(page[column], dtype=float))
+                totals[column] += np.bincount(rows, weights=weights, minlength=len(groups))
+
+        keys = list(groups)
+        result = {
+            column: _object_array(np, [key[position] for key in keys])
+            for position, column in enumerate(group_by)
+        }
+        if count:
+            result["count"] = counts
+        for column in sums:
+            result[f"{column}_sum"] = totals[column]
+        return result
+
+
+def _prefetch_links(rows: List[MyRow], paths: List[str]) -> None:
+    # Replaces the N+1 pattern of every row fetching its own links: linked
+    # rows are collected across the whole page, deduplicated by row id,
+    # loaded once each, and the same MyRow is attached to every row that
+    # references it. Dotted paths repeat this one level at a time.
+    pending = [(rows, _parse_projection(paths))]
+    while pending:
+        parents, node = pending.pop()
+        for column, children in node.items():
+            shared = {}
+
+            def share(value):
+                if _classify(value) != KIND_ROW:
+                    return value
+                row_id = _row_id(value)
+                if row_id not in shared:
+                    shared[row_id] = MyRow(value)
+                return shared[row_id]
+
+            for parent in parents:
+                value = parent.row[column]
+                if _classify(value) == KIND_LIST:
+                    parent._store(column, [share(item) for item in value])
+                else:
+                    parent._store(column, share(value))
+
+            linked = list(shared.values())
+            _load_rows([row.row for row in linked])
+            if children:
+                pending.append((linked, children))
+
+
+def _load_rows(rows: list, max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+    # Reading a row's cells makes Anvil fetch it; the fetches are issued
+    # concurrently so a page of distinct links costs one round trip of latency.
+    if len(rows) < 2:
+        for row in rows:
+            dict(row)
+        return
+
+    workers = min(max_workers, len(rows))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(dict, rows))
+
+
+def _prefetch_pages(pages, depth: int):
+    # Pulls up to `depth` pages ahead of the consumer on a worker thread so the
+    # next round trip overlaps with processing of the current page.
+    buffer = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for page in pages:
+                if not put((page, None)):
+                    return
+            put((done, None))
+        except Exception as e:
+            put((done, e))
+
+    worker = threading.Thread(target=produce, daemon=True)
+    worker.start()
+    try:
+        while True:
+            page, error = buffer.get()
+            if page is done:
+                if error is not None:
+                    raise error
+                return
+            yield page
+    finally:
+        stopped.set()
+
+
+def _require_numpy(feature: str):
+    # NumPy is optional; only the columnar helpers need it
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(f"{feature}() requires NumPy: pip install numpy") from e
+    return numpy
+
+
+def _column_value(value):
+    # Linked rows are represented by their IDs in columnar results
+    kind = _classify(value)
+    if kind == KIND_ROW:
+        return _row_id(value)
+    if kind == KIND_LIST:
+        return [_column_value(item) for item in value]
+    return value
+
+
+def _object_array(np, values: list):
+    # np.array would turn a list of lists into a 2-D array
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _infer_type(values: list, column_type: str = None):
+    # Narrows the type guessed from earlier pages of a column without a schema.
+    # Pages of only None leave it unknown, so they cannot make it a number
+    # column on their own
+    for value in values:
+        if value is None:
+            continue
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return "object"
+        column_type = "number"
+    return column_type
+
+
+def _to_array(np, values: list, column_type: str = None):
+    if column_type == "number":
+        # Missing numbers become NaN
+        return np.array(values, dtype=float)
+    return _object_array(np, values)
+
+
+def _as_numbers(np, array):
+    # Object array of numbers and None, decided to be a number column only
+    # once the whole column has been read
+    array[np.equal(array, None)] = np.nan
+    return array.astype(float)
+
+
+def _group_codes(np, columns: List[list], size: int):
+    # Returns a group code per row and the key tuple of every code
+    if not columns:
+        return np.zeros(size, dtype=np.intp), [()]
+
+    uniques, codes = [], []
+    for values in columns:
+        index = {}
+        codes.append(
+            np.fromiter(
+                (index.setdefault(value, len(index)) for value in values),
+                dtype=np.intp,
+                count=size,
+            )
+        )
+        uniques.append(list(index))
+
+    combined, inverse = np.unique(np.stack(codes, axis=1), axis=0, return_inverse=True)
+    keys = [
+        tuple(uniques[position][code] for position, code in enumerate(row))
+        for row in combined.tolist()
+    ]
+    return inverse.reshape(-1), keys
+
+
+class RowCache:
+    def __init__(self, max_size: int = 1000, ttl: float = 60.0):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()
+        # Keys cached from get(**kwargs); any write may change what they match
+        self._criteria_keys = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    # --- MAGIC METHODS ---
+
+    def __repr__(self):
+        return f"<RowCache: {len(self)}/{self.max_size} rows, ttl {self.ttl}s>"
+
+    def __len__(self):
+        return len(self._entries)
+
+    # --- PRIVATE METHODS ---
+
+    def _discard(self, key) -> bool:
+        if self._entries.pop(key, None) is None:
+            return False
+        self._criteria_keys.discard(key)
+        return True
+
+    # --- PUBLIC METHODS ---
+
+    def get(self, key) -> Optional[Row]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires, row = entry
+            if expires < time.monotonic():
+                self._discard(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return row
+
+    def set(self, key, row: Row) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, row)
+            self._entries.move_to_end(key)
+            if key[0] == "get":
+                self._criteria_keys.add(key)
+
+            while len(self._entries) > self.max_size:
+                oldest, _ = self._entries.popitem(last=False)
+                self._criteria_keys.discard(oldest)
+                self.evictions += 1
+
+    def invalidate(self, row_id: str = None) -> None:
+        with self._lock:
+            if row_id is not None and self._discard(("id", row_id)):
+                self.invalidations += 1
+            for key in list(self._criteria_keys):
+                self._discard(key)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._criteria_keys.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+def _cache_key_part(value):
+    if _classify(value) == KIND_ROW:
+        return ("row", value.get_id())
+    elif isinstance(value, (list, tuple)):
+        return tuple(_cache_key_part(item) for item in value)
+    elif isinstance(value, dict):
+        return tuple(sorted((k, _cache_key_part(v)) for k, v in value.items()))
+    else:
+        hash(value)
+        return value
+
+
+# Column types a replica can index and answer equality lookups on; other
+# types (lists of links, simple objects, media) match differently in Anvil
+_REPLICA_TYPES = {"string", "number", "bool", "date", "datetime", "liveObject", "link_single"}
+
+# Returned by Replica lookups it cannot answer, so the database is asked
+_NOT_SERVED = object()
+
+# Values a replica compares by equality; anything else, such as a q.*
+# expression, is left to the database
+_REPLICA_VALUES = (str, int, float, bool, datetime.date)
+
+
+def _replica_value(value) -> bool:
+    if value is None or _classify(value) == KIND_ROW:
+        return True
+    return _classify(value) == KIND_VALUE and isinstance(value, _REPLICA_VALUES)
+
+
+class Replica:
+    # A whole small table held in memory, with hash indexes on chosen
+    # columns, answering equality get/search lookups without a round trip.
+    # Writes made through the MyTable mark rows stale, and they are re-read
+    # before the next lookup.
+    def __init__(
+        self,
+        table: MyTable,
+        index_on: Iterable[str] = (),
+        refresh: float = None,
+        updated_column: str = None,
+    ):
+        self.table = table
+        self.schema = table.schema
+        self.index_on = [index_on] if isinstance(index_on, str) else list(index_on)
+        self.refresh_interval = refresh
+        self.updated_column = updated_column
+
+        for column in self.index_on + ([updated_column] if updated_column else []):
+            if column not in self.schema:
+                raise ValueError(f"Column {column!r} does not exist in {table.name}.")
+        for column in self.index_on:
+            column_type = self.schema.types[self.schema.index[column]]
+            if column_type not in _REPLICA_TYPES:
+                raise ValueError(
+                    f"Cannot index {column!r}: {column_type} columns are not "
+                    f"matched by equality."
+                )
+
+        self._lock = threading.RLock()
+        self._rows = {}
+        # row id -> values in schema order
+        self._values = {}
+        # column -> key -> {row id: None}, ordered like the table
+        self._indexes = {column: {} for column in self.index_on}
+        self._stale = set()
+        self._high_water = None
+        self._refreshed = None
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    # --- MAGIC METHODS ---
+
+    def __repr__(self):
+        return f"<Replica: {self.table.name} rows: {len(self)} indexes: {self.index_on}>"
+
+    def __len__(self):
+        return len(self._rows)
+
+    # --- PRIVATE METHODS ---
+
+    def _add(self, row: Row) -> None:
+        row_id = row.get_id()
+        values = tuple(row[column] for column in self.schema.columns)
+        self._rows[row_id] = row
+        self._values[row_id] = values
+        for column, index in self._indexes.items():
+            key = _cache_key_part(values[self.schema.index[column]])
+            index.setdefault(key, {})[row_id] = None
+
+        if self.updated_column is not None:
+            updated = values[self.schema.index[self.updated_column]]
+            if updated is not None and (
+                self._high_water is None or updated > self._high_water
+            ):
+                self._high_water = updated
+
+    def _remove(self, row_id: str) -> None:
+        values = self._values.pop(row_id, None)
+        self._rows.pop(row_id, None)
+        if values is None:
+            return
+
+        for column, index in self._indexes.items():
+            key = _cache_key_part(values[self.schema.index[column]])
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(row_id, None)
+                if not bucket:
+                    del index[key]
+
+    def _prepare(self) -> None:
+        # Brings the replica up to date before a lookup
+        if self.refresh_interval is not None and (
+            time.monotonic() - self._refreshed >= self.refresh_interval
+        ):
+            self.refresh()
+
+        if self._stale:
+            stale, self._stale = self._stale, set()
+            for row_id in stale:
+                self._remove(row_id)
+                row = self.table.table.get_by_id(row_id)
+                if row is not None:
+                    self._add(row)
+
+    def _match(self, kwargs: dict):
+        # Row ids matching every criterion, or _NOT_SERVED
+        criteria = []
+        for column, value in kwargs.items():
+            position = self.schema.index.get(column)
+            if position is None or self.schema.types[position] not in _REPLICA_TYPES:
+                return _NOT_SERVED
+            if not _replica_value(value):
+                return _NOT_SERVED
+            try:
+                criteria.append((column, position, _cache_key_part(value)))
+            except TypeError:
+                return _NOT_SERVED
+
+        indexed = [
+            self._indexes[column].get(key, {})
+            for column, _, key in criteria
+            if column in self._indexes
+        ]
+        # Start from the smallest index bucket; without one, scan the table
+        candidates = min(indexed, key=len) if indexed else self._values
+        return [
+            row_id
+            for row_id in candidates
+            if all(
+                _cache_key_part(self._values[row_id][position]) == key
+                for column, position, key in criteria
+            )
+        ]
+
+    # --- PUBLIC METHODS ---
+
+    def load(self) -> None:
+        with self._lock:
+            self._rows.clear()
+            self._values.clear()
+            for index in self._indexes.values():
+                index.clear()
+            self._stale.clear()
+            self._high_water = None
+
+            for row in self.table.table.search():
+                self._add(row)
+            self._refreshed = time.monotonic()
+
+    def refresh(self, full: bool = False) -> None:
+        # With an updated-at column only rows changed since the newest one
+        # seen are fetched; a change in row count (a delete) reloads fully
+        with self._lock:
+            self.refreshes += 1
+            if full or self.updated_column is None or self._high_water is None:
+                self.load()
+                return
+
+            changed = self.table.table.search(
+                **{self.updated_column: _query().greater_than(self._high_water)}
+            )
+            for row in changed:
+                self._remove(row.get_id())
+                self._add(row)
+
+            if len(self.table.table.search()) != len(self._rows):
+                self.load()
+                return
+            self._refreshed = time.monotonic()
+
+    def mark_stale(self, row_id: str) -> None:
+        with self._lock:
+            self._stale.add(row_id)
+
+    def get(self, kwargs: dict):
+        with self._lock:
+            self._prepare()
+            row_ids = self._match(kwargs)
+            if row_ids is _NOT_SERVED or len(row_ids) > 1:
+                # More than one match is an error Anvil should raise
+                self.misses += 1
+                return _NOT_SERVED
+
+            self.hits += 1
+            return self._rows[row_ids[0]] if row_ids else None
+
+    def get_by_id(self, row_id: str):
+        with self._lock:
+            self._prepare()
+            self.hits += 1
+            return self._rows.get(row_id)
+
+    def search(self, kwargs: dict):
+        with self._lock:
+            self._prepare()
+            row_ids = self._match(kwargs)
+            if row_ids is _NOT_SERVED:
+                self.misses += 1
+                return _NOT_SERVED
+
+            self.hits += 1
+            return [self._rows[row_id] for row_id in row_ids]
+
+    def stats(self) -> dict:
+        return {
+            "rows": len(self),
+            "indexes": list(self.index_on),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "stale": len(self._stale),
+        }
+
+
+def _split_query(query) -> Tuple[tuple, dict]:
+    # A query is a dict of column criteria, a query expression, or a
+    # list/tuple of query expressions.
+    serializer = Serializer()
+    if query is None:
+        return (), {}
+    elif isinstance(query, dict):
+        return (), serializer.to_anvil(query)
+    elif isinstance(query, (list, tuple)):
+        return tuple(serializer.to_anvil(list(query))), {}
+    else:
+        return (query,), {}
+
+
+def _export_default(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return getattr(value, "name", None) or str(value)
+
+
+def _encode_jsonl(records: List[dict], columns: List[str], first: bool) -> str:
+    return "".join(
+        json.dumps(record, default=_export_default) + "\n" for record in records
+    )
+
+
+def _encode_csv(records: List[dict], columns: List[str], first: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if first:
+        writer.writerow(columns)
+
+    for record in records:
+        cells = []
+        for column in columns:
+            value = record.get(column)
+            if value is None:
+                cells.append("")
+            elif isinstance(value, (dict, list)):
+                cells.append(json.dumps(value, default=_export_default))
+            elif isinstance(value, (str, int, float, bool)):
+                cells.append(value)
+            else:
+                cells.append(_export_default(value))
+        writer.writerow(cells)
+
+    return buffer.getvalue()
+
+
+_EXPORT_ENCODERS = {
+    "csv": _encode_csv,
+    "jsonl": _encode_jsonl,
+}
+
+
+def _open_text(source, mode: str = "r"):
+    # Paths are opened (and closed) here; file-like objects are used as given
+    if source is None or not isinstance(source, (str, os.PathLike)):
+        return contextlib.nullcontext(source)
+    return open(source, mode, newline="", encoding="utf-8")
+
+
+def _read_checkpoint(path) -> int:
+    if path is None or not os.path.exists(path):
+        return 0
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("records", 0)
+
+
+def _write_checkpoint(path, records: int) -> None:
+    if path is None:
+        return
+    # Written to a temporary file first so a crash never leaves it truncated
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"records": records}, f)
+    os.replace(temp_path, path)
+
+
+def _coerce_bool(value):
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in ("true", "t", "yes", "y", "1"):
+            return True
+        elif lowered in ("false", "f", "no", "n", "0"):
+            return False
+        raise ValueError(f"Cannot convert {value!r} to a bool.")
+    return bool(value)
+
+
+def _coerce_number(value):
+    if isinstance(value, str):
+        number = float(value)
+        return int(number) if number.is_integer() and "." not in value else number
+    return value
+
+
+def _coerce_date(value):
+    if isinstance(value, str):
+        return datetime.date.fromisoformat(value[:10])
+    return value
+
+
+def _coerce_datetime(value):
+    if isinstance(value, str):
+        return datetime.datetime.fromisoformat(value)
+    return value
+
+
+def _coerce_simple_object(value):
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
+
+
+def _coerce_media(value):
+    raise ValueError("Media columns cannot be imported from text.")
+
+
+# Keyed by the column types reported by Table.list_columns()
+_COERCERS = {
+    "string": str,
+    "number": _coerce_number,
+    "bool": _coerce_bool,
+    "date": _coerce_date,
+    "datetime": _coerce_datetime,
+    "simpleObject": _coerce_simple_object,
+    "media": _coerce_media,
+}
+
+_LINK_TYPES = {"liveObject", "link_single"}
+_MULTI_LINK_TYPES = {"liveObjectArray", "link_multiple"}
+
+
+def _split_multi_link(value: str, by_id: bool) -> list:
+    # A CSV cell of a multi-link column holds a JSON list of keys or row
+    # ids. When looking up by id, a list of ints is a lone Anvil row id
+    # such as "[2,27]"
+    if not value.startswith("["):
+        return [value]
+    try:
+        items = json.loads(value)
+    except ValueError:
+        return [value]
+    if not isinstance(items, list):
+        return [value]
+    if by_id and all(isinstance(item, int) for item in items):
+        return [value]
+    return items
+
+
+class _RecordImporter:
+    def __init__(self, table: "MyTable", links: dict = None, lookup_size: int = 10000):
+        schema = table.schema
+        self.types = dict(zip(schema.columns, schema.types))
+        # Link column -> (lookup, key column, or None for row ids)
+        self.lookups = {
+            column: self._make_lookup(spec, lookup_size)
+            for column, spec in (links or {}).items()
+        }
+
+    # --- PRIVATE METHODS ---
+
+    def _make_lookup(self, spec, lookup_size: int) -> Tuple[Callable, Optional[str]]:
+        # spec is a table, or a (table, key_column) pair; without a key
+        # column the values are row ids. Keys read as text are converted to
+        # the key column's type before they are looked up.
+        target, key = spec if isinstance(spec, (tuple, list)) else (spec, None)
+        if not isinstance(target, MyTable):
+            target = MyTable(target)
+
+        coerce = None
+        if key is not None:
+            position = target.schema.index.get(key)
+            if position is None:
+                raise ValueError(f"Column {key!r} does not exist in {target.name}.")
+            coerce = _COERCERS.get(target.schema.types[position])
+
+        def fetch(value):
+            if key is None:
+                row = target.get_by_id(value, return_anvil=True)
+            else:
+                row = target.get(return_anvil=True, **{key: value})
+            if row is None:
+                raise LookupError(
+                    f"No row in {target.name} with {key or 'id'} {value!r}."
+                )
+            return row
+
+        fetch = functools.lru_cache(maxsize=lookup_size)(fetch)
+
+        def lookup(value):
+            return fetch(coerce(value) if coerce is not None else value)
+
+        return lookup, key
+
+    def _coerce_link(self, column: str, value, multiple: bool):
+        if column not in self.lookups:
+            raise ValueError(f"No lookup given for link column {column!r}.")
+        lookup, key = self.lookups[column]
+
+        if not multiple:
+            return lookup(value)
+        if isinstance(value, str):
+            value = _split_multi_link(value, by_id=key is None)
+        return [lookup(item) for item in value]
+
+    # --- PUBLIC METHODS ---
+
+    def coerce(self, record: dict) -> dict:
+        row = {}
+        for column, value in record.items():
+            column_type = self.types.get(column)
+            if column_type is None:
+                raise ValueError(f"Unknown column {column!r}.")
+
+            if value is None or (value == "" and column_type != "string"):
+                row[column] = None
+            elif column_type in _LINK_TYPES:
+                row[column] = self._coerce_link(column, value, multiple=False)
+            elif column_type in _MULTI_LINK_TYPES:
+                row[column] = self._coerce_link(column, value, multiple=True)
+            else:
+                row[column] = _COERCERS.get(column_type, lambda v: v)(value)
+
+        return row
+
+
+class BatchResult:
+    def __init__(self, index: int, rows: list, error: Exception = None):
+        self.index = index
+        self.rows = rows
+        self.error = error
+        self.elapsed = 0.0
+
+    # --- PROPERTIES ---
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    # --- MAGIC METHODS ---
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"failed: {self.error!r}"
+        return f"<BatchResult {self.index}: {len(self.rows)} rows, {status}>"
+
+
+def _run_batches(
+    items: Iterable,
+    batch_size: int,
+    commit: Callable[[list], list],
+    on_progress: Optional[Callable[[dict], None]] = None,
+    stop_on_error: bool = False,
+) -> List[BatchResult]:
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1.")
+
+    results = []
+    processed = failed = 0
+    started = time.monotonic()
+    items = iter(items)
+
+    for index in itertools.count():
+        chunk = list(itertools.islice(items, batch_size))
+        if not chunk:
+            break
+
+        chunk_started = time.monotonic()
+        try:
+            result = BatchResult(index, commit(chunk))
+        except Exception as e:
+            # The failed chunk's transaction was rolled back, so none of its
+            # rows were written; keep the inputs so the caller can retry them.
+            result = BatchResult(index, chunk, error=e)
+            failed += len(chunk)
+        else:
+            processed += len(chunk)
+        result.elapsed = time.monotonic() - chunk_started
+        results.append(result)
+
+        if on_progress is not None:
+            elapsed = time.monotonic() - started
+            on_progress(
+                {
+                    "batch": index,
+                    "rows": processed,
+                    "failed": failed,
+                    "elapsed": elapsed,
+                    "rows_per_sec": processed / elapsed if elapsed else 0.0,
+                }
+            )
+
+        if result.error is not None and stop_on_error:
+            break
+
+    return results
+
+
+class TableWriter:
+    # Write-behind buffer: rows are queued in memory and added in batched
+    # transactions by a background thread, so callers do not pay a
+    # transaction per row. write() blocks while the queue is full.
+    def __init__(
+        self,
+        table: MyTable,
+        flush_rows: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = 1.0,
+        max_queue: int = 10000,
+        on_error: Optional[Callable[[List[dict], Exception], None]] = None,
+    ):
+        if flush_rows < 1:
+            raise ValueError("flush_rows must be at least 1.")
+        if flush_interval <= 0:
+            raise ValueError("flush_interval must be positive.")
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1.")
+
+        self.table = table
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.on_error = on_error
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._flush_requested = threading.Event()
+        self._closed = False
+        self._lock = threading.Lock()
+
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.last_error = None
+        self._flush_time = 0.0
+        self._last_flush_latency = None
+        self._max_flush_latency = 0.0
+
+        self._thread = threading.Thread(
+            target=self._run, name=f"mytables-writer-{table.name}", daemon=True
+        )
+        self._thread.start()
+        # Daemon threads are killed at exit, so pending rows are flushed first
+        atexit.register(self.close)
+
+    # --- PROPERTIES ---
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    # --- MAGIC METHODS ---
+
+    def __repr__(self):
+        return f"<TableWriter: {self.table.name} queued: {self._queue.qsize()}>"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # --- PRIVATE METHODS ---
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch = []
+            deadline = None
+            while len(batch) < self.flush_rows:
+                if self._flush_requested.is_set() and self._queue.empty():
+                    break
+
+                timeout = (
+                    self.flush_interval
+                    if deadline is None
+                    else deadline - time.perf_counter()
+                )
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=min(timeout, 0.05))
+                except queue.Empty:
+                    if not batch:
+                        deadline = None
+                    continue
+
+                if item is None:
+                    # close() sentinel; everything queued before it is in batch
+                    self._queue.task_done()
+                    stop = True
+                    break
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.perf_counter() + self.flush_interval
+
+            self._flush_requested.clear()
+            if batch:
+                self._commit(batch)
+
+    def _commit(self, batch: List[dict]) -> None:
+        started = time.perf_counter()
+        error = None
+        try:
+            self.table._add_chunk(batch, return_anvil=True)
+        except Exception as e:
+            error = e
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self.batches += 1
+            self._flush_time += elapsed
+            self._last_flush_latency = elapsed
+            self._max_flush_latency = max(self._max_flush_latency, elapsed)
+            if error is None:
+                self.rows_written += len(batch)
+            else:
+                self.rows_failed += len(batch)
+                self.failed_batches += 1
+                self.last_error = error
+
+        if error is not None and self.on_error is not None:
+            try:
+                self.on_error(batch, error)
+            except Exception:
+                pass
+
+        for _ in batch:
+            self._queue.task_done()
+
+    # --- PUBLIC METHODS ---
+
+    def write(self, timeout: float = None, **kwargs) -> None:
+        # Blocks while the queue is full; raises queue.Full after timeout
+        if self._closed:
+            raise RuntimeError(f"Writer for {self.table.name} is closed.")
+        self._queue.put(kwargs, timeout=timeout)
+
+    def write_many(self, rows: Iterable[dict], timeout: float = None) -> None:
+        for row in rows:
+            self.write(timeout=timeout, **row)
+
+    def flush(self) -> None:
+        # Returns once every row written so far has been committed or failed
+        self._flush_requested.set()
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "max_queue": self._queue.maxsize,
+                "rows_written": self.rows_written,
+                "rows_failed": self.rows_failed,
+                "batches": self.batches,
+                "failed_batches": self.failed_batches,
+                "last_flush_latency": self._last_flush_latency,
+                "mean_flush_latency": (
+                    self._flush_time / self.batches if self.batches else None
+                ),
+                "max_flush_latency": self._max_flush_latency,
+                "closed": self._closed,
+            }
+
 
 class MyTable:
+    # Handles shared process-wide by for_name(), keyed by class and name
+    _registry = {}
+    _registry_lock = threading.Lock()
+
     def __init__(self, name: str):
         self.name = name
         self.table = self._initialize_table(name)
+        self._cache = None
+        self._replica = None
+        self.transaction_policy = TransactionPolicy()
+        self.write_counters = WriteCounters()
+
+    # --- CLASS METHODS ---
+
+    @classmethod
+    def for_name(cls, name: str) -> "MyTable":
+        # Server functions can call this on every invocation: the table is
+        # looked up and its schema read once per process, not once per call
+        key = (cls, name)
+        table = cls._registry.get(key)
+        if table is None:
+            with cls._registry_lock:
+                table = cls._registry.get(key)
+                if table is None:
+                    table = cls._registry[key] = cls(name)
+        return table
+
+    @classmethod
+    def clear_registry(cls) -> None:
+        with cls._registry_lock:
+            cls._registry.clear()
 
     # --- PROPERTIES ---
 
@@ -298,15 +2363,32 @@ class MyTable:
     @table.setter
     def table(self, value: Table):
         self._table = value
+        self._schema = None
+
+    @property
+    def schema(self) -> Schema:
+        # Read once from list_columns() and shared by every row of the table
+        if self._schema is None:
+            self._schema = Schema(self.list_columns())
+        return self._schema
+
+    @property
+    def cache(self) -> Optional[RowCache]:
+        return self._cache
+
+    @property
+    def replica(self) -> Optional[Replica]:
+        return self._replica
 
     # --- MAGIC METHODS ---
 
     def __repr__(self):
-        return f"<MyTable: {self.name} columns: {self.list_columns()}>"
+        return f"<MyTable: {self.name} columns: {list(self.schema.columns)}>"
 
     # --- PRIVATE METHODS ---
 
     def _initialize_table(self, name: str) -> Table:
+        app_tables = _tables().app_tables
         if not hasattr(app_tables, name.lower()):
             raise AttributeError("The table {} does not exist in your app".format(name))
 
@@ -315,72 +2397,415 @@ class MyTable:
         except Exception:
             return getattr(app_tables, name)
 
+    def _wrap(self, row: Row, eager: bool = False) -> MyRow:
+        return MyRow(row, eager=eager, table=self)
+
+    def _invalidate(self, row: Row = None, added: Iterable[Row] = ()) -> None:
+        if self._cache is not None:
+            self._cache.invalidate(row.get_id() if row is not None else None)
+
+        if self._replica is not None:
+            for changed in itertools.chain([row] if row is not None else [], added):
+                self._replica.mark_stale(changed.get_id())
+
+    def _cache_get(self, key, fetch: Callable[[], Optional[Row]]) -> Optional[Row]:
+        if self._cache is None or key is None:
+            return fetch()
+
+        row = self._cache.get(key)
+        if row is None:
+            row = fetch()
+            if row is not None:
+                self._cache.set(key, row)
+                self._cache.set(("id", row.get_id()), row)
+
+        return row
+
     # --- PUBLIC METHODS (in_transaction) ---
 
-    @tables.in_transaction
+    @_in_transaction
     def add_row(self, return_anvil: bool = False, **kwargs) -> Union[MyRow, Row]:
         serializer = Serializer()
         kwargs = serializer.to_anvil(kwargs)
 
         row = self.table.add_row(**kwargs)
+        self._invalidate(added=[row])
         if return_anvil:
             return row
 
-        return MyRow(row)
+        return self._wrap(row)
+
+    @_in_transaction
+    def _add_chunk(self, chunk: List[dict], return_anvil: bool) -> list:
+        serializer = Serializer()
+        chunk = serializer.to_anvil(chunk)
+
+        add_rows = getattr(self.table, "add_rows", None)
+        if add_rows is not None:
+            rows = add_rows(chunk)
+        else:
+            rows = [self.table.add_row(**kwargs) for kwargs in chunk]
+        rows = list(rows)
+        self._invalidate(added=rows)
+
+        if return_anvil:
+            return rows
+
+        return [self._wrap(row) for row in rows]
+
+    def _diff(self, row: Union[Row, MyRow], kwargs: dict) -> dict:
+        if isinstance(row, MyRow):
+            changes = _changed_columns(row.row, kwargs, row._loaded)
+        else:
+            changes = _changed_columns(row, kwargs)
+        if len(changes) < len(kwargs):
+            self.write_counters.record_skip(len(kwargs) - len(changes), not changes)
+        return changes
+
+    def _update_changed(self, chunk: List[Tuple[Union[Row, MyRow], dict]]) -> list:
+        # Only rows with changed columns are written, and a chunk with none
+        # opens no transaction
+        serializer = Serializer()
+        values = serializer.to_anvil([kwargs for _, kwargs in chunk])
+
+        changed = []
+        for (row, _), kwargs in zip(chunk, values):
+            kwargs = self._diff(row, kwargs)
+            if kwargs:
+                changed.append((row, kwargs))
+
+        if changed:
+            self._update_chunk(changed)
+        return [row for row, _ in chunk]
+
+    @_in_transaction
+    def _update_chunk(self, chunk: List[Tuple[Union[Row, MyRow], dict]]) -> None:
+        for row, kwargs in chunk:
+            if isinstance(row, MyRow):
+                row._write(kwargs)
+            else:
+                self._write_row(row, kwargs)
+            self._invalidate(row.get_anvil_row() if isinstance(row, MyRow) else row)
+
+    def _write_row(self, row: Row, kwargs: dict) -> None:
+        row.update(**kwargs)
+        counters, columns = self.write_counters, len(kwargs)
+        _after_commit(lambda: counters.record_write(columns))
+
+    @_in_transaction
+    def _update_row(self, row: Union[Row, MyRow], kwargs: dict) -> None:
+        if isinstance(row, MyRow):
+            row._write(kwargs)
+            row = row.row
+        else:
+            self._write_row(row, kwargs)
+        self._invalidate(row)
 
-    @tables.in_transaction
     def update_row(
         self, row: Union[Row, MyRow], return_anvil: bool = False, **kwargs
     ) -> None:
-        if isinstance(row, MyRow):
-            row = row.row
+        kwargs = self._diff(row, kwargs)
+        if kwargs:
+            self._update_row(row, kwargs)
+
+    @_in_transaction
+    def _delete_chunk(self, chunk: List[Union[Row, MyRow]]) -> list:
+        for row in chunk:
+            anvil_row = row.row if isinstance(row, MyRow) else row
+            anvil_row.delete()
+            self._invalidate(anvil_row)
+        return chunk
+
+    @_in_transaction
+    def _delete_first(self, args: tuple, kwargs: dict, chunk_size: int) -> int:
+        search = self.table.search(*args, _query().page_size(chunk_size), **kwargs)
+        rows = list(itertools.islice(search, chunk_size))
+        for row in rows:
+            row.delete()
+            self._invalidate(row)
+        return len(rows)
+
+    @_in_transaction
+    def _delete_range(self, args: tuple, kwargs: dict, key: str, chunk_size: int) -> int:
+        # Finds the key of the chunk_size-th matching row and deletes every
+        # match up to it with one delete_all_rows call, instead of a call
+        # per row. Rows sharing that key are deleted with it, so when they
+        # would make the chunk more than twice chunk_size, the chunk's own
+        # rows are deleted one by one instead.
+        q = _query()
+        head = self.table.search(
+            *args,
+            q.all_of(**{key: q.not_(None)}),
+            _tables().order_by(key),
+            q.page_size(chunk_size),
+            **kwargs,
+        )
+        rows = list(itertools.islice(head, chunk_size))
+        if not rows:
+            return 0
+
+        doomed = self.table.search(
+            *args, q.all_of(**{key: q.less_than_or_equal_to(rows[-1][key])}), **kwargs
+        )
+        count = len(doomed)
+        if count > 2 * chunk_size:
+            for row in rows:
+                row.delete()
+                self._invalidate(row)
+            return len(rows)
+
+        doomed.delete_all_rows()
+        if self._cache is not None:
+            # The deleted rows' ids are not known, so no cached row is kept
+            self._cache.clear()
+        return count
+
+    # --- PUBLIC METHODS (batched) ---
+
+    def add_rows(
+        self,
+        rows: Iterable[dict],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        return_anvil: bool = False,
+        on_progress: Optional[Callable[[dict], None]] = None,
+        stop_on_error: bool = False,
+    ) -> List[BatchResult]:
+        return _run_batches(
+            rows,
+            batch_size,
+            lambda chunk: self._add_chunk(chunk, return_anvil),
+            on_progress=on_progress,
+            stop_on_error=stop_on_error,
+        )
+
+    def writer(
+        self,
+        flush_rows: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = 1.0,
+        max_queue: int = 10000,
+        on_error: Optional[Callable[[List[dict], Exception], None]] = None,
+    ) -> TableWriter:
+        return TableWriter(
+            self,
+            flush_rows=flush_rows,
+            flush_interval=flush_interval,
+            max_queue=max_queue,
+            on_error=on_error,
+        )
+
+    def update_rows(
+        self,
+        updates: Iterable[Tuple[Union[Row, MyRow], dict]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        on_progress: Optional[Callable[[dict], None]] = None,
+        stop_on_error: bool = False,
+    ) -> List[BatchResult]:
+        return _run_batches(
+            updates,
+            batch_size,
+            self._update_changed,
+            on_progress=on_progress,
+            stop_on_error=stop_on_error,
+        )
+
+    def delete_rows(
+        self,
+        rows: Iterable[Union[Row, MyRow]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        on_progress: Optional[Callable[[dict], None]] = None,
+        stop_on_error: bool = False,
+    ) -> List[BatchResult]:
+        return _run_batches(
+            rows,
+            batch_size,
+            self._delete_chunk,
+            on_progress=on_progress,
+            stop_on_error=stop_on_error,
+        )
+
+    def delete_where(
+        self,
+        *query,
+        chunk_size: int = DEFAULT_BATCH_SIZE,
+        key: str = None,
+        dry_run: bool = False,
+        on_progress: Optional[Callable[[dict], None]] = None,
+        **kwargs,
+    ) -> int:
+        # Each chunk is its own transaction, so an interrupted purge keeps
+        # what it deleted and running it again carries on with what is left.
+        # With a sortable key column, chunks are deleted by key range.
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
 
-        row.update(**kwargs)
+        serializer = Serializer()
+        args = tuple(serializer.to_anvil(list(query)))
+        kwargs = serializer.to_anvil(kwargs)
+        if dry_run:
+            return len(self.table.search(*args, **kwargs))
+
+        deleted = 0
+        started = time.monotonic()
+        try:
+            for index in itertools.count():
+                count = 0
+                if key is not None:
+                    count = self._delete_range(args, kwargs, key, chunk_size)
+                    if not count:
+                        # Rows with an empty key are left for row-by-row chunks
+                        key = None
+                if key is None:
+                    count = self._delete_first(args, kwargs, chunk_size)
+                if not count:
+                    break
+
+                deleted += count
+                if on_progress is not None:
+                    elapsed = time.monotonic() - started
+                    on_progress(
+                        {
+                            "batch": index,
+                            "rows": deleted,
+                            "elapsed": elapsed,
+                            "rows_per_sec": deleted / elapsed if elapsed else 0.0,
+                        }
+                    )
+        finally:
+            if deleted and self._replica is not None:
+                self._replica.refresh(full=True)
+
+        return deleted
 
     # --- PUBLIC METHODS ---
 
-    def get(self, return_anvil: bool = False, **kwargs) -> Union[MyRow, Row, None]:
+    def get(
+        self, return_anvil: bool = False, eager: bool = False, **kwargs
+    ) -> Union[MyRow, Row, None]:
         serializer = Serializer()
         kwargs = serializer.to_anvil(kwargs)
 
-        row = self.table.get(**kwargs)
+        try:
+            key = ("get", _cache_key_part(kwargs))
+        except TypeError:
+            # Unhashable criteria are never cached
+            key = None
+
+        row = _NOT_SERVED
+        if self._replica is not None:
+            row = self._replica.get(kwargs)
+        if row is _NOT_SERVED:
+            row = self._cache_get(key, lambda: self.table.get(**kwargs))
         if not row:
             return None
 
         if return_anvil:
             return row
 
-        return MyRow(row)
+        return self._wrap(row, eager=eager)
 
     def get_by_id(
-        self, row_id: str, return_anvil: bool = False
+        self, row_id: str, return_anvil: bool = False, eager: bool = False
     ) -> Union[MyRow, Row, None]:
-        row = self.table.get_by_id(row_id)
+        if self._replica is not None:
+            row = self._replica.get_by_id(row_id)
+        else:
+            row = self._cache_get(("id", row_id), lambda: self.table.get_by_id(row_id))
         if not row:
             return None
 
         if return_anvil:
             return row
 
-        return MyRow(row)
+        return self._wrap(row, eager=eager)
 
     def search(
-        self, *args, return_anvil: bool = False, convert_limit: int = 100, **kwargs
-    ) -> Union[SearchIterator, list]:
+        self,
+        *args,
+        return_anvil: bool = False,
+        eager: bool = False,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch_pages: int = 0,
+        prefetch: Iterable[str] = None,
+        convert_limit: int = None,
+        **kwargs,
+    ) -> Union[MySearchIterator, SearchIterator]:
+        if convert_limit is not None:
+            # Results are streamed a page at a time, so there is no longer a
+            # size above which they are left unconverted
+            warnings.warn(
+                "convert_limit is deprecated and ignored; search results are "
+                "always converted a page at a time.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
         serializer = Serializer()
         args = serializer.to_anvil(args)
         kwargs = serializer.to_anvil(kwargs)
 
-        search = self.table.search(*args, **kwargs) or []
+        search = _NOT_SERVED
+        if self._replica is not None and not args:
+            # A list of the replica's rows, in place of a SearchIterator
+            search = self._replica.search(kwargs)
+        if search is _NOT_SERVED:
+            search = self.table.search(*args, **kwargs)
         if return_anvil:
             return search
-        elif len(search) > convert_limit:
-            print(
-                f"WARNING: Search returned more than {convert_limit} results.  Will not convert to MySearchIterator object."
-            )
-            return search
 
-        return MySearchIterator(search)
+        return MySearchIterator(
+            search,
+            eager=eager,
+            page_size=page_size,
+            prefetch_pages=prefetch_pages,
+            table=self,
+            prefetch=prefetch,
+        )
+
+    def enable_cache(self, max_size: int = 1000, ttl: float = 60.0) -> RowCache:
+        self._cache = RowCache(max_size=max_size, ttl=ttl)
+        return self._cache
+
+    def disable_cache(self) -> None:
+        self._cache = None
+
+    def replicate(
+        self,
+        index_on: Iterable[str] = (),
+        refresh: float = None,
+        updated_column: str = None,
+    ) -> Replica:
+        replica = Replica(
+            self, index_on=index_on, refresh=refresh, updated_column=updated_column
+        )
+        replica.load()
+        self._replica = replica
+        return replica
+
+    def drop_replica(self) -> None:
+        self._replica = None
+
+    def set_transaction_policy(
+        self,
+        max_retries: int = 8,
+        base_delay: float = 0.05,
+        max_delay: float = 2.0,
+        max_concurrency: int = None,
+    ) -> TransactionPolicy:
+        self.transaction_policy = TransactionPolicy(
+            max_retries=max_retries,
+            base_delay=base_delay,
+            max_delay=max_delay,
+            max_concurrency=max_concurrency,
+        )
+        return self.transaction_policy
+
+    def transaction_stats(self) -> dict:
+        return self.transaction_policy.stats()
+
+    def write_stats(self) -> dict:
+        return self.write_counters.stats()
+
+    def cache_stats(self) -> dict:
+        return self._cache.stats() if self._cache is not None else {}
 
     def has_row(self, row: Union[Row, MyRow]) -> bool:
         if isinstance(row, MyRow):
@@ -390,8 +2815,1244 @@ class MyTable:
     def list_columns(self) -> list:
         return self.table.list_columns() or []
 
+    def refresh_schema(self) -> Schema:
+        # Rows already read keep the schema they were read with
+        self._schema = None
+        return self.schema
+
     def to_csv(self) -> str:
         return self.table.to_csv()
 
+    def import_csv(
+        self,
+        source,
+        links: dict = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        rejects=None,
+        checkpoint: str = None,
+        on_progress: Optional[Callable[[dict], None]] = None,
+    ) -> dict:
+        with _open_text(source) as f:
+            return self._import_records(
+                csv.DictReader(f),
+                lambda record: record,
+                links,
+                batch_size,
+                rejects,
+                checkpoint,
+                on_progress,
+            )
+
+    def import_jsonl(
+        self,
+        source,
+        links: dict = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        rejects=None,
+        checkpoint: str = None,
+        on_progress: Optional[Callable[[dict], None]] = None,
+    ) -> dict:
+        with _open_text(source) as f:
+            return self._import_records(
+                f, json.loads, links, batch_size, rejects, checkpoint, on_progress
+            )
+
+    def _import_records(
+        self,
+        records: Iterable,
+        parse: Callable,
+        links: Optional[dict],
+        batch_size: int,
+        rejects,
+        checkpoint: Optional[str],
+        on_progress: Optional[Callable[[dict], None]],
+    ) -> dict:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+
+        importer = _RecordImporter(self, links)
+        skip = _read_checkpoint(checkpoint)
+        started = time.monotonic()
+        stats = {
+            "batch": 0,
+            "records": skip,
+            "rows": 0,
+            "failed": 0,
+            "skipped": skip,
+            "elapsed": 0.0,
+            "rows_per_sec": 0.0,
+        }
+
+        with _open_text(rejects, "a") as reject_file:
+
+            def reject(number: int, record, error: Exception):
+                stats["failed"] += 1
+                if reject_file is not None:
+                    entry = {"record": number, "data": record, "error": str(error)}
+                    reject_file.write(json.dumps(entry, default=_export_default))
+                    reject_file.write("\n")
+
+            def commit(batch: list, position: int):
+                if batch:
+                    try:
+                        self._add_chunk([row for _, _, row in batch], True)
+                        stats["rows"] += len(batch)
+                    except Exception:
+                        # Retry rows one at a time to isolate the bad ones
+                        for number, record, row in batch:
+                            try:
+                                self._add_chunk([row], True)
+                                stats["rows"] += 1
+                            except Exception as e:
+                                reject(number, record, e)
+
+                if reject_file is not None:
+                    reject_file.flush()
+                _write_checkpoint(checkpoint, position)
+
+                nonlocal batches
+                elapsed = time.monotonic() - started
+                stats["batch"] = batches
+                stats["records"] = position
+                stats["elapsed"] = elapsed
+                stats["rows_per_sec"] = stats["rows"] / elapsed if elapsed else 0.0
+                if on_progress is not None:
+                    on_progress(dict(stats))
+                batches += 1
+
+            batch = []
+            batches = 0
+            position = committed = skip
+            for number, item in enumerate(records):
+                if number < skip:
+                    continue
+                position = number + 1
+                if isinstance(item, str):
+                    item = item.rstrip("\r\n")
+                    if not item.strip():
+                        continue
+
+                record = item
+                try:
+                    record = parse(item)
+                    batch.append((number, record, importer.coerce(record)))
+                except Exception as e:
+                    reject(number, record, e)
+
+                if len(batch) >= batch_size:
+                    commit(batch, position)
+                    batch = []
+                    committed = position
+
+            if batch or position != committed:
+                commit(batch, position)
+
+        return stats
+
+    def search_many(
+        self,
+        queries: Iterable,
+        return_anvil: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        return_exceptions: bool = False,
+    ) -> List["CallResult"]:
+        calls = []
+        for query in queries:
+            args, kwargs = _split_query(query)
+            calls.append(
+                TableCall(self, "search", *args, return_anvil=return_anvil, **kwargs)
+            )
+
+        return gather(
+            *calls, max_workers=max_workers, return_exceptions=return_exceptions
+        )
+
+    def export(
+        self,
+        fmt: str = "csv",
+        query=None,
+        columns: Iterable[str] = None,
+        chunk_rows: int = DEFAULT_PAGE_SIZE,
+        depth: int = 0,
+        out=None,
+    ):
+        if fmt not in _EXPORT_ENCODERS:
+            raise ValueError(
+                f"Unsupported export format {fmt!r}; "
+                f"expected one of {sorted(_EXPORT_ENCODERS)}."
+            )
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be at least 1.")
+
+        if columns is None:
+            columns = self.schema.columns
+        chunks = self._export_chunks(fmt, query, list(columns), chunk_rows, depth)
+        if out is None:
+            return chunks
+
+        for chunk in chunks:
+            out.write(chunk)
+
+    def _export_chunks(
+        self, fmt: str, query, columns: List[str], chunk_rows: int, depth: int
+    ):
+        encode = _EXPORT_ENCODERS[fmt]
+        serializer = Serializer(columns=columns, depth=depth)
+        # Dotted columns project linked rows, so the output keys are the
+        # top-level column names.
+        headers = list(dict.fromkeys(column.split(".")[0] for column in columns))
+
+        args, kwargs = _split_query(query)
+        args += (_query().page_size(chunk_rows),)
+        if not depth:
+            # Links are written as ids, so their rows never need fetching
+            args += (_query().fetch_only(*headers),)
+
+        rows = iter(self.table.search(*args, **kwargs))
+        first = True
+        while True:
+            page = list(itertools.islice(rows, chunk_rows))
+            if not page and not first:
+                return
+
+            records = [serializer.serialize(row) for row in page]
+            yield encode(records, headers, first)
+            first = False
+
+    def query(self) -> Query:
+        return Query(self)
+
+    def serve_pages(
+        self,
+        sort_keys: Iterable[str],
+        name: str = None,
+        columns: Iterable[str] = None,
+        query=None,
+        depth: int = 0,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_page_size: int = 500,
+        max_ties: int = 5000,
+        wire: str = "rows",
+        authorize: Optional[Callable[[], bool]] = None,
+        require_user=None,
+    ) -> PageEndpoint:
+        # Registers endpoint.page as a server callable; only tables served
+        # this way can be paged from the client
+        endpoint = PageEndpoint(
+            self,
+            name or f"{self.name}_page",
+            sort_keys,
+            columns=columns,
+            query=query,
+            depth=depth,
+            page_size=page_size,
+            max_page_size=max_page_size,
+            max_ties=max_ties,
+            wire=wire,
+            authorize=authorize,
+        )
+        options = {} if require_user is None else {"require_user": require_user}
+        anvil.server.callable(endpoint.name, **options)(endpoint.page)
+        return endpoint
+
     def get_anvil_table(self):
         return self.table
+
+
+# --- QUERY BUILDER ---
+
+
+class PushdownWarning(UserWarning):
+    # A Query predicate that is evaluated in Python instead of the database
+    pass
+
+
+# Returned by a lookup's compiler when its value cannot be expressed in q.*
+_NO_PUSHDOWN = object()
+
+
+def _literal(text) -> bool:
+    # like patterns have no escape character, so values containing wildcards
+    # cannot be matched literally in the database
+    return isinstance(text, str) and "%" not in text and "_" not in text
+
+
+def _text(test: Callable) -> Callable:
+    return lambda cell, value: isinstance(cell, str) and test(cell, value)
+
+
+# lookup -> compiler to a q.* expression, or _NO_PUSHDOWN for values it
+# cannot express
+_LOOKUPS = {
+    "exact": lambda value: value,
+    "ne": lambda value: _query().not_(value),
+    "gt": lambda value: _query().greater_than(value),
+    "gte": lambda value: _query().greater_than_or_equal_to(value),
+    "lt": lambda value: _query().less_than(value),
+    "lte": lambda value: _query().less_than_or_equal_to(value),
+    "between": lambda bounds: _query().between(*bounds),
+    "in": lambda values: _query().any_of(*values),
+    "not_in": lambda values: _query().none_of(*values),
+    "isnull": lambda null: None if null else _query().not_(None),
+    "like": lambda pattern: _query().like(pattern),
+    "ilike": lambda pattern: _query().ilike(pattern),
+    "contains": lambda text: (
+        _query().like(f"%{text}%") if _literal(text) else _NO_PUSHDOWN
+    ),
+    "icontains": lambda text: (
+        _query().ilike(f"%{text}%") if _literal(text) else _NO_PUSHDOWN
+    ),
+    "startswith": lambda text: (
+        _query().like(f"{text}%") if _literal(text) else _NO_PUSHDOWN
+    ),
+    "endswith": lambda text: (
+        _query().like(f"%{text}") if _literal(text) else _NO_PUSHDOWN
+    ),
+    "search": lambda text: _query().full_text_match(text),
+    # Anvil has no regular expression query, so these are always in Python
+    "regex": lambda pattern: _NO_PUSHDOWN,
+}
+
+# lookup -> test of a cell in Python, for the lookups whose compiler can
+# return _NO_PUSHDOWN
+_FALLBACKS = {
+    "contains": _text(lambda cell, text: text in cell),
+    "icontains": _text(lambda cell, text: text.lower() in cell.lower()),
+    "startswith": _text(lambda cell, text: cell.startswith(text)),
+    "endswith": _text(lambda cell, text: cell.endswith(text)),
+    "regex": _text(lambda cell, pattern: re.search(pattern, cell)),
+}
+
+
+class Query:
+    # Builds MyTable searches from Django-style lookups (age__gt=30) and
+    # compiles them to q.* expressions, so rows are filtered, ordered and
+    # limited by the database. Every method returns a new Query.
+    def __init__(self, table: MyTable):
+        self.table = table
+        self._criteria = {}
+        self._expressions = ()
+        self._residual = ()
+        self._ordering = ()
+        self._limit = None
+        self._only = None
+
+    # --- MAGIC METHODS ---
+
+    def __repr__(self):
+        args, kwargs = self.compile()
+        return f"<Query: {self.table.name} args={args} kwargs={kwargs}>"
+
+    def __iter__(self):
+        return iter(self.search())
+
+    # --- PRIVATE METHODS ---
+
+    def _copy(self, **changes) -> "Query":
+        query = Query(self.table)
+        query.__dict__.update(self.__dict__)
+        query._criteria = dict(self._criteria)
+        query.__dict__.update(changes)
+        return query
+
+    def _matches(self, row: Union[Row, MyRow]) -> bool:
+        anvil_row = row.row if isinstance(row, MyRow) else row
+        for column, test, value in self._residual:
+            if column is None:
+                if not test(row):
+                    return False
+            elif not test(anvil_row[column], value):
+                return False
+        return True
+
+    def _filtered(self, search):
+        rows = (row for row in search if self._matches(row))
+        if self._limit is not None:
+            rows = itertools.islice(rows, self._limit)
+        return rows
+
+    # --- PUBLIC METHODS ---
+
+    def where(self, *predicates, **lookups) -> "Query":
+        criteria = {}
+        expressions = []
+        residual = list(self._residual)
+
+        for predicate in predicates:
+            if callable(predicate):
+                warnings.warn(
+                    f"Python predicate {predicate!r} cannot be pushed down; "
+                    f"rows of {self.table.name} are filtered after fetching.",
+                    PushdownWarning,
+                    stacklevel=2,
+                )
+                residual.append((None, predicate, None))
+            else:
+                # A q.* expression, passed to search() as is
+                expressions.append(predicate)
+
+        serializer = Serializer()
+        for lookup, value in lookups.items():
+            column, _, operator = lookup.partition("__")
+            operator = operator or "exact"
+            if operator not in _LOOKUPS:
+                raise ValueError(
+                    f"Unsupported lookup {operator!r}; "
+                    f"expected one of {sorted(_LOOKUPS)}."
+                )
+
+            value = serializer.to_anvil(value)
+            expression = _LOOKUPS[operator](value)
+            if expression is _NO_PUSHDOWN:
+                warnings.warn(
+                    f"{lookup}={value!r} cannot be pushed down; "
+                    f"rows of {self.table.name} are filtered after fetching.",
+                    PushdownWarning,
+                    stacklevel=2,
+                )
+                residual.append((column, _FALLBACKS[operator], value))
+            else:
+                criteria.setdefault(column, []).append(expression)
+
+        merged = dict(self._criteria)
+        for column, column_expressions in criteria.items():
+            merged.setdefault(column, [])
+            merged[column] = merged[column] + column_expressions
+
+        return self._copy(
+            _criteria=merged,
+            _expressions=self._expressions + tuple(expressions),
+            _residual=tuple(residual),
+        )
+
+    def order_by(self, *columns: str) -> "Query":
+        # "-created" sorts descending
+        ordering = tuple(
+            (column[1:], False) if column.startswith("-") else (column, True)
+            for column in columns
+        )
+        return self._copy(_ordering=self._ordering + ordering)
+
+    def limit(self, rows: int) -> "Query":
+        if rows < 0:
+            raise ValueError("limit cannot be negative.")
+        return self._copy(_limit=rows)
+
+    def only(self, *columns: str) -> "Query":
+        # Fetches just these columns, as q.fetch_only
+        return self._copy(_only=columns)
+
+    def compile(self) -> Tuple[tuple, dict]:
+        query = _query()
+        args = list(self._expressions)
+        for column, ascending in self._ordering:
+            args.append(_tables().order_by(column, ascending=ascending))
+        if self._only:
+            args.append(query.fetch_only(*self._only))
+        if self._limit is not None and not self._residual:
+            # The first page need not be larger than the limit
+            args.append(query.page_size(max(1, min(self._limit, DEFAULT_PAGE_SIZE))))
+
+        kwargs = {
+            column: expressions[0]
+            if len(expressions) == 1
+            else query.all_of(*expressions)
+            for column, expressions in self._criteria.items()
+        }
+        return tuple(args), kwargs
+
+    def search(
+        self, return_anvil: bool = False, **options
+    ) -> Union[MySearchIterator, SearchIterator, Iterable]:
+        # Without Python-side predicates the result is a MySearchIterator (or
+        # SearchIterator), limited by slicing; otherwise an iterator of the
+        # rows that pass them.
+        args, kwargs = self.compile()
+        search = self.table.search(*args, return_anvil=return_anvil, **options, **kwargs)
+        if self._residual:
+            return self._filtered(search)
+        if self._limit is not None:
+            return search[: self._limit]
+        return search
+
+    def first(self, return_anvil: bool = False, **options) -> Union[MyRow, Row, None]:
+        for row in self.limit(1).search(return_anvil=return_anvil, **options):
+            return row
+        return None
+
+    def count(self) -> int:
+        if self._residual:
+            return sum(1 for _ in self.search(return_anvil=True))
+        return len(self.search(return_anvil=True))
+
+
+# --- PAGING ENDPOINT ---
+
+CURSOR_VERSION = 1
+
+
+def _cursor_value(value):
+    # Sort keys are kept in the cursor as JSON; dates are tagged so they
+    # come back as dates
+    if isinstance(value, datetime.datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"$date": value.isoformat()}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"Cannot page on values of type {type(value).__name__}.")
+
+
+def _from_cursor_value(value):
+    if isinstance(value, dict):
+        if "$datetime" in value:
+            return datetime.datetime.fromisoformat(value["$datetime"])
+        return datetime.date.fromisoformat(value["$date"])
+    return value
+
+
+def _fetch_only(projection: dict):
+    # {"name": None, "customer": {"name": None}} ->
+    # q.fetch_only("name", customer=q.fetch_only("name"))
+    names = [column for column, child in projection.items() if child is None]
+    links = {
+        column: _fetch_only(child)
+        for column, child in projection.items()
+        if child is not None
+    }
+    return _query().fetch_only(*names, **links)
+
+
+class PageEndpoint:
+    # Serves a table to client grids one page at a time. Each page ends with
+    # an opaque cursor holding the last sort key, and the next page searches
+    # from that key rather than counting rows from the start, so deep pages
+    # cost the same as the first. Rows sharing the last key are listed in
+    # the cursor so ties are neither repeated nor skipped; at most max_ties
+    # of them, since cursors come back from the client unsigned. Clients can
+    # only choose the sort key (from sort_keys), the direction and the page
+    # size; the table, filter and columns are fixed here.
+    def __init__(
+        self,
+        table: MyTable,
+        name: str,
+        sort_keys: Iterable[str],
+        columns: Iterable[str] = None,
+        query=None,
+        depth: int = 0,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_page_size: int = 500,
+        max_ties: int = 5000,
+        wire: str = "rows",
+        authorize: Optional[Callable[[], bool]] = None,
+    ):
+        sort_keys = [sort_keys] if isinstance(sort_keys, str) else list(sort_keys)
+        if not sort_keys:
+            raise ValueError("At least one sort key is required.")
+        if not 1 <= page_size <= max_page_size:
+            raise ValueError("page_size must be between 1 and max_page_size.")
+        if max_ties < 1:
+            raise ValueError("max_ties must be at least 1.")
+        if wire not in ("rows", "columnar"):
+            raise ValueError(f"Unknown wire format {wire!r}; expected 'rows' or 'columnar'.")
+
+        self.table = table
+        self.name = name
+        self.sort_keys = sort_keys
+        self.columns = list(columns) if columns is not None else None
+        self.query = query
+        self.depth = depth
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        self.max_ties = max_ties
+        self.wire = wire
+        self.authorize = authorize
+
+    # --- MAGIC METHODS ---
+
+    def __repr__(self):
+        return f"<PageEndpoint: {self.name} on {self.table.name}>"
+
+    def __call__(self, **kwargs) -> dict:
+        return self.page(**kwargs)
+
+    # --- PRIVATE METHODS ---
+
+    def _encode_cursor(self, sort: str, descending: bool, value, seen: list) -> str:
+        cursor = {
+            "version": CURSOR_VERSION,
+            "endpoint": self.name,
+            "sort": sort,
+            "descending": descending,
+            "value": _cursor_value(value),
+            "seen": seen,
+        }
+        text = json.dumps(cursor, separators=(",", ":"))
+        return base64.urlsafe_b64encode(text.encode("utf-8")).decode("ascii")
+
+    def _decode_cursor(self, token: str) -> dict:
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+            value = _from_cursor_value(cursor["value"])
+            seen = cursor["seen"]
+            valid = (
+                cursor["version"] == CURSOR_VERSION
+                and cursor["endpoint"] == self.name
+                and cursor["sort"] in self.sort_keys
+                and isinstance(cursor["descending"], bool)
+                and isinstance(seen, list)
+                and len(seen) <= self.max_ties
+            )
+        except Exception:
+            valid = False
+        if not valid:
+            raise ValueError("Invalid cursor.")
+
+        cursor["value"] = value
+        cursor["seen"] = set(seen)
+        return cursor
+
+    def _search(self, sort: str, descending: bool, cursor: Optional[dict], fetch: int):
+        q = _query()
+        args, kwargs = _split_query(self.query)
+        if cursor is None:
+            # Empty keys cannot be compared, so those rows are never served
+            start = q.not_(None)
+        elif descending:
+            start = q.less_than_or_equal_to(cursor["value"])
+        else:
+            start = q.greater_than_or_equal_to(cursor["value"])
+
+        args += (
+            q.all_of(**{sort: start}),
+            _tables().order_by(sort, ascending=not descending),
+            q.page_size(fetch),
+        )
+        if self.columns is not None:
+            # Linked rows in the projection arrive with the page instead of
+            # being fetched one by one as they are serialized
+            projection = _parse_projection(self.columns)
+            projection.setdefault(sort, None)
+            args += (_fetch_only(projection),)
+        return self.table.search(*args, return_anvil=True, **kwargs)
+
+    def _encode_rows(self, rows: list):
+        if self.wire == "columnar":
+            return ColumnarEncoder(columns=self.columns, depth=self.depth).encode(rows)
+        return Serializer(columns=self.columns, depth=self.depth).serialize(rows)
+
+    # --- PUBLIC METHODS ---
+
+    def page(
+        self,
+        sort: str = None,
+        cursor: str = None,
+        page_size: int = None,
+        descending: bool = False,
+    ) -> dict:
+        if self.authorize is not None and not self.authorize():
+            raise PermissionError(f"Not allowed to read {self.name}.")
+
+        if cursor is not None:
+            state = self._decode_cursor(cursor)
+            sort, descending = state["sort"], state["descending"]
+        else:
+            state = None
+            sort = sort or self.sort_keys[0]
+            if sort not in self.sort_keys:
+                raise ValueError(f"Cannot sort {self.name} by {sort!r}.")
+            descending = bool(descending)
+
+        page_size = page_size or self.page_size
+        if not 1 <= page_size <= self.max_page_size:
+            raise ValueError(f"page_size must be between 1 and {self.max_page_size}.")
+
+        seen = state["seen"] if state else set()
+        rows = []
+        # One extra row tells whether another page follows
+        for row in self._search(sort, descending, state, page_size + len(seen) + 1):
+            if _row_id(row) in seen:
+                continue
+            rows.append(row)
+            if len(rows) > page_size:
+                break
+
+        more = len(rows) > page_size
+        rows = rows[:page_size]
+        next_cursor = None
+        if more:
+            last = rows[-1][sort]
+            tied = [_row_id(row) for row in rows if row[sort] == last]
+            if state and state["value"] == last:
+                tied += list(seen)
+            if len(tied) > self.max_ties:
+                raise ValueError(
+                    f"More than {self.max_ties} rows of {self.name} share the sort "
+                    f"key {last!r}; sort by a more selective column."
+                )
+            next_cursor = self._encode_cursor(sort, descending, last, tied)
+
+        return {
+            "rows": self._encode_rows(rows),
+            "cursor": next_cursor,
+            "sort": sort,
+            "descending": descending,
+        }
+
+
+class TableCall:
+    def __init__(self, table: MyTable, method: str, *args, **kwargs):
+        if method.startswith("_") or not callable(getattr(table, method, None)):
+            raise AttributeError(f"MyTable has no public method {method!r}.")
+
+        self.table = table
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+
+    # --- MAGIC METHODS ---
+
+    def __repr__(self):
+        return f"<TableCall: {self.table.name}.{self.method}>"
+
+    # --- PUBLIC METHODS ---
+
+    def run(self):
+        return getattr(self.table, self.method)(*self.args, **self.kwargs)
+
+
+class CallResult:
+    def __init__(self, call: TableCall, value=None, error: Exception = None):
+        self.call = call
+        self.value = value
+        self.error = error
+        self.elapsed = 0.0
+
+    # --- PROPERTIES ---
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    # --- MAGIC METHODS ---
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"failed: {self.error!r}"
+        return f"<CallResult {self.call!r}: {status} in {self.elapsed:.3f}s>"
+
+
+def _timed_call(call: TableCall) -> CallResult:
+    started = time.monotonic()
+    try:
+        result = CallResult(call, value=call.run())
+    except Exception as e:
+        result = CallResult(call, error=e)
+    result.elapsed = time.monotonic() - started
+    return result
+
+
+def gather(
+    *calls: TableCall,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    return_exceptions: bool = False,
+) -> List[CallResult]:
+    # Runs independent table calls on a bounded thread pool so their round
+    # trips overlap. Results are returned in the order the calls were given.
+    if not calls:
+        return []
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1.")
+
+    workers = min(max_workers, len(calls))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_timed_call, calls))
+
+    if not return_exceptions:
+        for result in results:
+            if result.error is not None:
+                raise result.error
+
+    return results
+
+
+# --- ASYNC ---
+
+
+class AsyncMyTable:
+    # Runs MyTable's blocking calls on a bounded thread pool so they can be
+    # awaited from an event loop; at most max_workers calls run at once.
+    def __init__(
+        self,
+        table: Union[str, MyTable],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        executor: concurrent.futures.Executor = None,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+
+        self.table = table if isinstance(table, MyTable) else MyTable.for_name(table)
+        self._max_workers = max_workers
+        self._executor = executor
+        # Executors passed in are shared, and left for the caller to shut down
+        self._owns_executor = executor is None
+
+    # --- PROPERTIES ---
+
+    @property
+    def executor(self) -> concurrent.futures.Executor:
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="mytables"
+            )
+        return self._executor
+
+    # --- MAGIC METHODS ---
+
+    def __repr__(self):
+        return f"<AsyncMyTable: {self.table.name}>"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    # --- PRIVATE METHODS ---
+
+    async def _run(self, function: Callable, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(function, *args, **kwargs)
+        )
+
+    # --- PUBLIC METHODS ---
+
+    async def add_row(self, return_anvil: bool = False, **kwargs) -> Union[MyRow, Row]:
+        return await self._run(self.table.add_row, return_anvil=return_anvil, **kwargs)
+
+    async def update_row(
+        self, row: Union[Row, MyRow], return_anvil: bool = False, **kwargs
+    ) -> None:
+        return await self._run(
+            self.table.update_row, row, return_anvil=return_anvil, **kwargs
+        )
+
+    async def add_rows(self, rows: Iterable[dict], **kwargs) -> List[BatchResult]:
+        return await self._run(self.table.add_rows, rows, **kwargs)
+
+    async def update_rows(
+        self, updates: Iterable[Tuple[Union[Row, MyRow], dict]], **kwargs
+    ) -> List[BatchResult]:
+        return await self._run(self.table.update_rows, updates, **kwargs)
+
+    async def get(
+        self, return_anvil: bool = False, eager: bool = False, **kwargs
+    ) -> Union[MyRow, Row, None]:
+        return await self._run(
+            self.table.get, return_anvil=return_anvil, eager=eager, **kwargs
+        )
+
+    async def get_by_id(
+        self, row_id: str, return_anvil: bool = False, eager: bool = False
+    ) -> Union[MyRow, Row, None]:
+        return await self._run(
+            self.table.get_by_id, row_id, return_anvil=return_anvil, eager=eager
+        )
+
+    def search(
+        self,
+        *args,
+        return_anvil: bool = False,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        **kwargs,
+    ) -> AsyncMySearchIterator:
+        # The search itself runs when iteration starts, on the executor
+        start = functools.partial(
+            self.table.search,
+            *args,
+            return_anvil=return_anvil,
+            page_size=page_size,
+            **kwargs,
+        )
+        return AsyncMySearchIterator(start, page_size=page_size, table=self)
+
+    async def has_row(self, row: Union[Row, MyRow]) -> bool:
+        return await self._run(self.table.has_row, row)
+
+    async def list_columns(self) -> list:
+        return await self._run(self.table.list_columns)
+
+    async def to_csv(self) -> str:
+        return await self._run(self.table.to_csv)
+
+    async def import_csv(self, source, **kwargs) -> dict:
+        return await self._run(self.table.import_csv, source, **kwargs)
+
+    async def import_jsonl(self, source, **kwargs) -> dict:
+        return await self._run(self.table.import_jsonl, source, **kwargs)
+
+    def close(self) -> None:
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def get_table(self) -> MyTable:
+        return self.table
+
+
+class AsyncMySearchIterator:
+    def __init__(
+        self,
+        start: Callable[[], Union[MySearchIterator, SearchIterator]],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        table: AsyncMyTable = None,
+    ):
+        self._start = start
+        self._page_size = page_size
+        self._table = table
+        self._search = None
+
+    # --- MAGIC METHODS ---
+
+    def __repr__(self):
+        return f"<AsyncMySearchIterator: {self._search or 'not started'}>"
+
+    async def __aiter__(self):
+        search = await self.get_search()
+        pages = _search_pages(search, self._page_size)
+        done = object()
+
+        # The next page is always being fetched while the current one is
+        # consumed, so round trips overlap with the caller's processing
+        future = self._submit(next, pages, done)
+        try:
+            while True:
+                page = await future
+                if page is done:
+                    return
+                future = self._submit(next, pages, done)
+                for row in page:
+                    yield row
+        finally:
+            future.cancel()
+
+    # --- PRIVATE METHODS ---
+
+    def _submit(self, function: Callable, *args) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._table.executor, function, *args)
+
+    async def _run(self, function: Callable, *args, **kwargs):
+        return await self._submit(functools.partial(function, *args, **kwargs))
+
+    async def _my_search(self) -> MySearchIterator:
+        search = await self.get_search()
+        if isinstance(search, MySearchIterator):
+            return search
+        return MySearchIterator(
+            search, page_size=self._page_size, table=self._table.table
+        )
+
+    # --- PUBLIC METHODS ---
+
+    async def get_search(self) -> Union[MySearchIterator, SearchIterator]:
+        if self._search is None:
+            self._search = await self._run(self._start)
+        return self._search
+
+    async def count(self) -> int:
+        search = await self.get_search()
+        return await self._run(len, search)
+
+    async def get_index(self, index: int) -> Union[MyRow, Row, None]:
+        search = await self.get_search()
+        if isinstance(search, MySearchIterator):
+            return await self._run(search.get_index, index)
+        return await self._run(search.__getitem__, index)
+
+    async def to_list(self) -> list:
+        return [row async for row in self]
+
+    async def serialize(
+        self, columns: Iterable[str] = None, depth: int = None
+    ) -> List[dict]:
+        search = await self.get_search()
+        serializer = Serializer(columns=columns, depth=depth)
+        return await self._run(serializer.serialize, search)
+
+    async def to_columns(self, columns: Iterable[str] = None) -> dict:
+        search = await self._my_search()
+        return await self._run(search.to_columns, columns)
+
+    async def aggregate(self, **kwargs) -> dict:
+        search = await self._my_search()
+        return await self._run(search.aggregate, **kwargs)
+
+
+def _search_pages(search, page_size: int):
+    # Pages of MyRow objects, converted and link-prefetched as for sync
+    # iteration, or pages of Anvil rows for return_anvil searches
+    if isinstance(search, MySearchIterator):
+        return search._iter_pages()
+
+    def pages():
+        rows = iter(search)
+        while True:
+            page = list(itertools.islice(rows, page_size))
+            if not page:
+                return
+            yield page
+
+    return pages()
+
+
+# --- INSTRUMENTATION ---
+
+# Methods timed as operations while instrumentation is enabled. Wrappers are
+# only installed by enable_instrumentation(), so when it is disabled the
+# classes run their original, unwrapped methods.
+_INSTRUMENTED_OPERATIONS = [
+    (MyTable, "get"),
+    (MyTable, "get_by_id"),
+    (MyTable, "search"),
+    (MyTable, "search_many"),
+    (MyTable, "add_row"),
+    (MyTable, "update_row"),
+    (MyTable, "add_rows"),
+    (MyTable, "update_rows"),
+    (MyTable, "import_csv"),
+    (MyTable, "import_jsonl"),
+    (MyTable, "has_row"),
+    (MyTable, "list_columns"),
+    (MyRow, "__getitem__"),
+    (MyRow, "update"),
+    (MyRow, "flush"),
+    (MyRow, "serialize"),
+    (MySearchIterator, "__getitem__"),
+    (MySearchIterator, "_convert_rows"),
+    (MySearchIterator, "get_index"),
+    (MySearchIterator, "serialize"),
+    (Serializer, "to_anvil"),
+    (Serializer, "serialize"),
+]
+
+_COUNTERS = ("calls", "wall_time", "table_calls", "rows_converted", "max_depth")
+
+
+class Instrumentation:
+    def __init__(self):
+        self.operations = {}
+        self.hooks = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._originals = {}
+
+    # --- PROPERTIES ---
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    # --- PRIVATE METHODS ---
+
+    def _frames(self) -> list:
+        frames = getattr(self._local, "frames", None)
+        if frames is None:
+            frames = self._local.frames = []
+        return frames
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        frames = self._frames()
+        if frames:
+            frames[-1][counter] += amount
+
+    def _observe_depth(self, depth: int) -> None:
+        frames = self._frames()
+        if frames and depth > frames[-1]["max_depth"]:
+            frames[-1]["max_depth"] = depth
+
+    def _record(self, name: str, frame: dict) -> None:
+        with self._lock:
+            totals = self.operations.get(name)
+            if totals is None:
+                totals = self.operations[name] = dict.fromkeys(_COUNTERS, 0)
+            totals["calls"] += 1
+            totals["wall_time"] += frame["wall_time"]
+            totals["table_calls"] += frame["table_calls"]
+            totals["rows_converted"] += frame["rows_converted"]
+            totals["max_depth"] = max(totals["max_depth"], frame["max_depth"])
+            hooks = list(self.hooks)
+
+        event = dict(frame, operation=name)
+        for hook in hooks:
+            hook(event)
+
+    def _wrap_operation(self, name: str, method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            with self.track(name):
+                return method(*args, **kwargs)
+
+        return wrapper
+
+    def _install(self) -> None:
+        instrumentation = self
+
+        def patch(cls, name, replacement):
+            # The first patch of a method keeps the real original
+            self._originals.setdefault((cls, name), cls.__dict__[name])
+            setattr(cls, name, replacement)
+
+        for cls, name in _INSTRUMENTED_OPERATIONS:
+            method = cls.__dict__[name]
+            patch(cls, name, self._wrap_operation(f"{cls.__name__}.{name}", method))
+
+        row_init = MyRow.__init__
+
+        def counting_init(row, *args, **kwargs):
+            instrumentation._count("rows_converted")
+            row_init(row, *args, **kwargs)
+
+        convert_nested = MyRow._convert_nested_rows
+
+        def tracking_convert(row, value, processed_objects=None):
+            local = instrumentation._local
+            local.depth = getattr(local, "depth", 0) + 1
+            instrumentation._observe_depth(local.depth)
+            try:
+                return convert_nested(row, value, processed_objects)
+            finally:
+                local.depth -= 1
+
+        visit_row = Serializer._visit_row
+
+        def tracking_visit(serializer, stack, row, container, slot, depth, *args):
+            instrumentation._count("rows_converted")
+            instrumentation._observe_depth(depth)
+            return visit_row(serializer, stack, row, container, slot, depth, *args)
+
+        write, delete = MyRow._write, MyRow.delete
+
+        def counting_write(row, kwargs):
+            instrumentation._count("table_calls")
+            return write(row, kwargs)
+
+        def counting_delete(row):
+            instrumentation._count("table_calls")
+            return delete(row)
+
+        table_property = MyTable.__dict__["table"]
+        counting_table = property(
+            lambda table: _CountingTable(table_property.fget(table), instrumentation),
+            table_property.fset,
+        )
+
+        patch(MyRow, "__init__", counting_init)
+        patch(MyRow, "_convert_nested_rows", tracking_convert)
+        patch(MyRow, "_write", counting_write)
+        patch(MyRow, "delete", self._wrap_operation("MyRow.delete", counting_delete))
+        patch(Serializer, "_visit_row", tracking_visit)
+        patch(MyTable, "table", counting_table)
+
+    def _uninstall(self) -> None:
+        for (cls, name), original in self._originals.items():
+            setattr(cls, name, original)
+        self._originals.clear()
+
+    # --- PUBLIC METHODS ---
+
+    @contextlib.contextmanager
+    def track(self, name: str):
+        frames = self._frames()
+        frame = dict.fromkeys(_COUNTERS[2:], 0)
+        frames.append(frame)
+        started = time.perf_counter()
+        try:
+            yield frame
+        finally:
+            frame["wall_time"] = time.perf_counter() - started
+            frames.pop()
+            if frames:
+                parent = frames[-1]
+                parent["table_calls"] += frame["table_calls"]
+                parent["rows_converted"] += frame["rows_converted"]
+                parent["max_depth"] = max(parent["max_depth"], frame["max_depth"])
+            self._record(name, frame)
+
+    def stats(self) -> dict:
+        with self._lock:
+            operations = {name: dict(totals) for name, totals in self.operations.items()}
+        return {"enabled": self.enabled, "operations": operations}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.operations.clear()
+
+
+class _CountingTable:
+    # Stands in for the Anvil table while instrumentation is enabled and
+    # counts every method call made on it.
+    def __init__(self, table: Table, instrumentation: Instrumentation):
+        self._table = table
+        self._instrumentation = instrumentation
+
+    def __getattr__(self, name):
+        attribute = getattr(self._table, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            self._instrumentation._count("table_calls")
+            return attribute(*args, **kwargs)
+
+        return call
+
+
+_instrumentation = Instrumentation()
+
+
+def enable_instrumentation() -> Instrumentation:
+    if not _instrumentation.enabled:
+        _instrumentation._install()
+    return _instrumentation
+
+
+def disable_instrumentation() -> None:
+    if _instrumentation.enabled:
+        _instrumentation._uninstall()
+
+
+@contextlib.contextmanager
+def instrument():
+    # Enables instrumentation for the duration of the block
+    was_enabled = _instrumentation.enabled
+    enable_instrumentation()
+    try:
+        yield _instrumentation
+    finally:
+        if not was_enabled:
+            disable_instrumentation()
+
+
+def track(name: str):
+    # Groups everything inside the block under one named operation, such as
+    # a server call; counts are only collected while instrumentation is on.
+    if not _instrumentation.enabled:
+        return contextlib.nullcontext()
+    return _instrumentation.track(name)
+
+
+def add_hook(hook: Callable[[dict], None]) -> None:
+    _instrumentation.hooks.append(hook)
+
+
+def remove_hook(hook: Callable[[dict], None]) -> None:
+    _instrumentation.hooks.remove(hook)
+
+
+def stats() -> dict:
+    return _instrumentation.stats()
+
+
+def reset_stats() -> None:
+    _instrumentation.reset()
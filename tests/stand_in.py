@@ -0,0 +1,16 @@
+"""The app's table module loaded against the in-memory Anvil stand-in.
+
+Test modules import ``fake_anvil`` and ``mt`` from here rather than setting
+up the stand-in themselves.
+"""
+
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks")
+)
+
+import fake_anvil  # noqa: E402
+
+mt = fake_anvil.load_mytables()
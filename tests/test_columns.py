@@ -0,0 +1,59 @@
+"""Tests for MySearchIterator.to_columns against the in-memory Anvil stand-in.
+
+Run from the repository root:
+
+    python -m unittest discover tests
+"""
+
+import math
+import unittest
+
+from stand_in import fake_anvil, mt
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "to_columns requires NumPy")
+class ToColumnsTest(unittest.TestCase):
+    def setUp(self):
+        fake_anvil.drop_tables()
+        fake_anvil.add_table("cells", [("value", "number"), ("label", "string")])
+        self.cells = mt.MyTable("cells")
+        # The first page holds nothing but empty cells
+        self.cells.add_rows({"value": None, "label": None} for _ in range(10))
+        self.cells.add_rows({"value": i, "label": str(i)} for i in range(15))
+
+    def schemaless(self):
+        # A search over a raw Anvil search, with no table schema to consult
+        search = fake_anvil.app_tables.cells.search()
+        return mt.MySearchIterator(search, page_size=10)
+
+    def test_uses_the_table_schema(self):
+        columns = self.cells.search(page_size=10).to_columns()
+
+        self.assertEqual(columns["value"].dtype, float)
+        self.assertEqual(columns["label"].dtype, object)
+
+    def test_empty_pages_do_not_decide_the_type(self):
+        columns = self.schemaless().to_columns(["value", "label"])
+
+        self.assertEqual(columns["label"].dtype, object)
+        self.assertEqual(list(columns["label"]), [None] * 10 + [str(i) for i in range(15)])
+        self.assertEqual(columns["value"].dtype, float)
+        self.assertTrue(all(math.isnan(value) for value in columns["value"][:10]))
+        self.assertEqual(list(columns["value"][10:]), list(range(15)))
+
+    def test_column_of_only_empty_cells(self):
+        for row in self.cells.search():
+            row.update(label=None)
+
+        columns = self.schemaless().to_columns(["label"])
+        self.assertEqual(columns["label"].dtype, object)
+        self.assertEqual(list(columns["label"]), [None] * 25)
+
+
+if __name__ == "__main__":
+    unittest.main()
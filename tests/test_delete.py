@@ -0,0 +1,134 @@
+"""Tests for MyTable.delete_where and delete_rows against the in-memory
+Anvil stand-in.
+
+Run from the repository root:
+
+    python -m unittest discover tests
+"""
+
+import sys
+import unittest
+
+from stand_in import fake_anvil, mt
+
+q = sys.modules["anvil.tables.query"]
+
+
+class DeleteWhereTest(unittest.TestCase):
+    def setUp(self):
+        fake_anvil.drop_tables()
+        fake_anvil.add_table("logs", [("day", "number"), ("level", "string")])
+        self.logs = mt.MyTable("logs")
+        self.logs.add_rows(
+            {"day": i // 10, "level": ["info", "error"][i % 2]} for i in range(1000)
+        )
+        self.logs.add_rows([{"day": None, "level": "info"}] * 5)
+
+    def count(self, **kwargs) -> int:
+        return len(fake_anvil.app_tables.logs.search(**kwargs))
+
+    def test_dry_run_deletes_nothing(self):
+        self.assertEqual(self.logs.delete_where(day=q.less_than(10), dry_run=True), 100)
+        self.assertEqual(self.count(), 1005)
+
+    def test_row_by_row(self):
+        progress = []
+        deleted = self.logs.delete_where(
+            level="info", chunk_size=100, on_progress=progress.append
+        )
+
+        self.assertEqual(deleted, 505)
+        self.assertEqual(self.count(level="info"), 0)
+        self.assertEqual(self.count(), 500)
+        self.assertEqual([p["rows"] for p in progress], [100, 200, 300, 400, 500, 505])
+
+    def test_by_key_range(self):
+        fake_anvil.reset_round_trips()
+        deleted = self.logs.delete_where(level="info", chunk_size=100, key="day")
+
+        self.assertEqual(deleted, 505)
+        self.assertEqual(self.count(level="info"), 0)
+        # A search and a delete per chunk rather than a call per row
+        self.assertLess(fake_anvil.reset_round_trips(), 50)
+
+    def test_chunks_stay_bounded_when_keys_repeat(self):
+        self.logs.add_rows([{"day": -1, "level": "debug"}] * 600)
+        sizes = []
+        self.logs.delete_where(
+            level="debug",
+            chunk_size=100,
+            key="day",
+            on_progress=lambda p: sizes.append(p["rows"]),
+        )
+
+        chunks = [b - a for a, b in zip([0] + sizes, sizes)]
+        self.assertEqual(sum(chunks), 600)
+        self.assertLessEqual(max(chunks), 200)
+
+    def test_resumes_after_interruption(self):
+        def interrupt(progress):
+            if progress["batch"] == 1:
+                raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            self.logs.delete_where(
+                day=q.less_than(50), chunk_size=100, key="day", on_progress=interrupt
+            )
+        # The two chunks committed before the interruption stay deleted
+        self.assertEqual(self.count(day=q.less_than(50)), 300)
+
+        self.assertEqual(self.logs.delete_where(day=q.less_than(50), key="day"), 300)
+        self.assertEqual(self.count(day=q.less_than(50)), 0)
+
+    def test_retries_conflicts(self):
+        fake_anvil.simulate_conflicts(2)
+        deleted = self.logs.delete_where(level="error", chunk_size=200, key="day")
+
+        self.assertEqual(deleted, 500)
+        self.assertEqual(self.count(level="error"), 0)
+        self.assertGreaterEqual(self.logs.transaction_stats()["retries"], 2)
+
+    def test_range_delete_clears_cached_rows(self):
+        self.logs.enable_cache()
+        row_id = fake_anvil.app_tables.logs.search(day=1)[0].get_id()
+        self.assertIsNotNone(self.logs.get_by_id(row_id))
+
+        self.logs.delete_where(day=q.less_than(3), key="day")
+
+        self.assertIsNone(self.logs.get_by_id(row_id))
+
+    def test_row_by_row_delete_drops_cached_rows(self):
+        self.logs.enable_cache()
+        row_id = fake_anvil.app_tables.logs.search(day=1)[0].get_id()
+        self.assertIsNotNone(self.logs.get_by_id(row_id))
+
+        self.logs.delete_where(day=q.less_than(3))
+
+        self.assertIsNone(self.logs.get_by_id(row_id))
+
+    def test_replica_is_refreshed(self):
+        self.logs.replicate(index_on=["level"])
+        self.logs.delete_where(level="error", key="day")
+
+        self.assertEqual(len(self.logs.search(level="error")), 0)
+        self.assertEqual(self.logs.replica.stats()["rows"], 505)
+
+
+class DeleteRowsTest(unittest.TestCase):
+    def setUp(self):
+        fake_anvil.drop_tables()
+        fake_anvil.add_table("logs", [("day", "number")])
+        self.logs = mt.MyTable("logs")
+        self.logs.add_rows({"day": i} for i in range(300))
+
+    def test_deletes_in_batches(self):
+        rows = list(self.logs.search(day=q.less_than(250)))
+        results = self.logs.delete_rows(rows, batch_size=100)
+
+        self.assertEqual([len(result.rows) for result in results], [100, 100, 50])
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(len(fake_anvil.app_tables.logs.search()), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Tests for MyRow dirty-field tracking against the in-memory Anvil
+stand-in.
+
+Run from the repository root:
+
+    python -m unittest discover tests
+"""
+
+import unittest
+
+from stand_in import fake_anvil, mt
+
+
+class DirtyTrackingTest(unittest.TestCase):
+    def setUp(self):
+        fake_anvil.drop_tables()
+        fake_anvil.add_table(
+            "orders", [("total", "number"), ("meta", "simpleObject")]
+        )
+        for i in range(3):
+            fake_anvil.app_tables.orders.add_row(total=i, meta={"index": i})
+        self.orders = mt.MyTable("orders")
+
+    def stored(self, total: int) -> dict:
+        return fake_anvil.app_tables.orders.get(total=total)["meta"]
+
+    def test_dict_edited_in_place_is_written(self):
+        row = self.orders.get(total=0)
+        meta = row["meta"]
+        meta["seen"] = True
+        row["meta"] = meta
+
+        self.assertEqual(self.stored(0), {"index": 0, "seen": True})
+        self.assertEqual(self.orders.write_stats()["writes"], 1)
+
+    def test_update_row_with_edited_dict_is_written(self):
+        row = self.orders.get(total=1)
+        meta = row["meta"]
+        meta["seen"] = True
+        self.orders.update_row(row, meta=meta)
+
+        self.assertEqual(self.stored(1), {"index": 1, "seen": True})
+
+    def test_unchanged_values_are_skipped(self):
+        row = self.orders.get(total=2)
+        row["meta"] = dict(row["meta"])
+        row["total"] = 2
+
+        stats = self.orders.write_stats()
+        self.assertEqual(stats["writes"], 0)
+        self.assertEqual(stats["skipped_writes"], 2)
+
+    def test_retried_conflicts_count_one_write(self):
+        row = self.orders.get(total=0)
+        fake_anvil.simulate_conflicts(2)
+        row["total"] = 10
+
+        self.assertEqual(self.orders.write_stats()["writes"], 1)
+        self.assertEqual(self.orders.transaction_stats()["retries"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
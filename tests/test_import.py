@@ -0,0 +1,79 @@
+"""Tests for MyTable.import_csv link lookups against the in-memory Anvil
+stand-in.
+
+Run from the repository root:
+
+    python -m unittest discover tests
+"""
+
+import io
+import json
+import unittest
+
+from stand_in import fake_anvil, mt
+
+
+def csv_cell(value) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+class ImportLinksTest(unittest.TestCase):
+    def setUp(self):
+        fake_anvil.drop_tables()
+        fake_anvil.add_table("tags", [("code", "number"), ("name", "string")])
+        fake_anvil.add_table(
+            "notes", [("title", "string"), ("tag", "link_single"), ("tags", "link_multiple")]
+        )
+        self.tags = [
+            fake_anvil.app_tables.tags.add_row(code=code, name=f"tag {code}")
+            for code in (1, 2, 3)
+        ]
+        self.notes = mt.MyTable("notes")
+
+    def import_csv(self, lines: list, links: dict) -> list:
+        rejects = io.StringIO()
+        stats = self.notes.import_csv(
+            io.StringIO("\n".join(lines) + "\n"), links=links, rejects=rejects
+        )
+        self.assertEqual(stats["failed"], 0, rejects.getvalue())
+        return list(fake_anvil.app_tables.notes.search())
+
+    def names(self, rows) -> list:
+        return [row["name"] for row in rows]
+
+    def test_single_link_by_number_key(self):
+        rows = self.import_csv(["title,tag", "a,2"], {"tag": ("tags", "code")})
+
+        self.assertEqual(rows[0]["tag"]["name"], "tag 2")
+
+    def test_multi_link_by_string_keys(self):
+        cell = csv_cell(json.dumps(["tag 1", "tag 3"]))
+        rows = self.import_csv(
+            ["title,tags", f"a,{cell}", "b,tag 2"], {"tags": ("tags", "name")}
+        )
+
+        self.assertEqual(self.names(rows[0]["tags"]), ["tag 1", "tag 3"])
+        self.assertEqual(self.names(rows[1]["tags"]), ["tag 2"])
+
+    def test_multi_link_by_number_keys(self):
+        rows = self.import_csv(["title,tags", 'a,"[1,2]"'], {"tags": ("tags", "code")})
+
+        self.assertEqual(self.names(rows[0]["tags"]), ["tag 1", "tag 2"])
+
+    def test_multi_link_by_row_ids(self):
+        ids = [tag.get_id() for tag in self.tags]
+        rows = self.import_csv(
+            ["title,tags", f"a,{csv_cell(json.dumps(ids[:2]))}", f"b,{csv_cell(ids[2])}"],
+            {"tags": "tags"},
+        )
+
+        self.assertEqual(self.names(rows[0]["tags"]), ["tag 1", "tag 2"])
+        self.assertEqual(self.names(rows[1]["tags"]), ["tag 3"])
+
+    def test_unknown_key_column(self):
+        with self.assertRaises(ValueError):
+            self.notes.import_csv(io.StringIO("title,tag\na,1\n"), links={"tag": ("tags", "nope")})
+
+
+if __name__ == "__main__":
+    unittest.main()
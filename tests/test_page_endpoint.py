@@ -0,0 +1,166 @@
+"""Tests for MyTable.serve_pages against the in-memory Anvil stand-in.
+
+Run from the repository root:
+
+    python -m unittest discover tests
+"""
+
+import base64
+import datetime
+import json
+import sys
+import unittest
+
+from stand_in import fake_anvil, mt
+
+anvil_server = sys.modules["anvil.server"]
+
+
+def walk(endpoint, **kwargs):
+    # Every page of an endpoint, following cursors to the end
+    pages = [endpoint.page(**kwargs)]
+    page_size = kwargs.get("page_size")
+    while pages[-1]["cursor"] is not None:
+        pages.append(endpoint.page(cursor=pages[-1]["cursor"], page_size=page_size))
+    return pages
+
+
+def forge(cursor: str, **changes) -> str:
+    state = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    state.update(changes)
+    text = json.dumps(state)
+    return base64.urlsafe_b64encode(text.encode("utf-8")).decode("ascii")
+
+
+class PageEndpointTest(unittest.TestCase):
+    def setUp(self):
+        fake_anvil.drop_tables()
+        fake_anvil.add_table(
+            "tasks",
+            [
+                ("rank", "number"),
+                ("status", "string"),
+                ("due", "datetime"),
+            ],
+        )
+        self.tasks = mt.MyTable("tasks")
+        start = datetime.datetime(2024, 1, 1)
+        self.tasks.add_rows(
+            {
+                "rank": i,
+                "status": ["open", "done", "blocked"][i % 3],
+                "due": start + datetime.timedelta(hours=i // 4),
+            }
+            for i in range(250)
+        )
+        self.tasks.add_row(rank=None, status=None, due=None)
+
+    def test_walk_returns_every_row_once_in_order(self):
+        endpoint = self.tasks.serve_pages(sort_keys=["rank"], columns=["rank"])
+        pages = walk(endpoint, page_size=40)
+
+        ranks = [row["rank"] for page in pages for row in page["rows"]]
+        self.assertEqual(ranks, list(range(250)))
+        self.assertEqual([len(page["rows"]) for page in pages], [40] * 6 + [10])
+        self.assertIsNone(pages[-1]["cursor"])
+
+    def test_registered_as_server_callable(self):
+        self.tasks.serve_pages(sort_keys="rank", name="tasks_by_rank")
+
+        page = anvil_server.call("tasks_by_rank", page_size=5)
+        self.assertEqual([row["rank"] for row in page["rows"]], [0, 1, 2, 3, 4])
+        page = anvil_server.call("tasks_by_rank", cursor=page["cursor"], page_size=5)
+        self.assertEqual([row["rank"] for row in page["rows"]], [5, 6, 7, 8, 9])
+
+    def test_descending(self):
+        endpoint = self.tasks.serve_pages(sort_keys=["rank"], columns=["rank"])
+        pages = walk(endpoint, descending=True, page_size=30)
+
+        ranks = [row["rank"] for page in pages for row in page["rows"]]
+        self.assertEqual(ranks, list(range(249, -1, -1)))
+        self.assertTrue(all(page["descending"] for page in pages))
+
+    def test_ties_are_neither_repeated_nor_skipped(self):
+        endpoint = self.tasks.serve_pages(
+            sort_keys=["status"], columns=["rank", "status"]
+        )
+        # Pages far smaller than each run of equal statuses
+        pages = walk(endpoint, page_size=7)
+
+        rows = [row for page in pages for row in page["rows"]]
+        self.assertEqual(sorted(row["rank"] for row in rows), list(range(250)))
+        statuses = [row["status"] for row in rows]
+        self.assertEqual(statuses, sorted(statuses))
+
+    def test_datetime_keys(self):
+        endpoint = self.tasks.serve_pages(sort_keys=["due"], columns=["rank", "due"])
+        pages = walk(endpoint, page_size=6)
+
+        rows = [row for page in pages for row in page["rows"]]
+        self.assertEqual(sorted(row["rank"] for row in rows), list(range(250)))
+        dues = [row["due"] for row in rows]
+        self.assertEqual(dues, sorted(dues))
+
+    def test_columnar_wire_format(self):
+        endpoint = self.tasks.serve_pages(
+            sort_keys="rank", columns=["rank", "status"], wire="columnar"
+        )
+        page = endpoint.page(page_size=10)
+
+        self.assertEqual(page["rows"]["format"], "columnar")
+        self.assertEqual(page["rows"]["count"], 10)
+        self.assertEqual(page["rows"]["columns"], ["rank", "status"])
+
+    def test_rejects_sort_keys_not_served(self):
+        endpoint = self.tasks.serve_pages(sort_keys=["rank"])
+
+        with self.assertRaises(ValueError):
+            endpoint.page(sort="status")
+        with self.assertRaises(ValueError):
+            endpoint.page(page_size=endpoint.max_page_size + 1)
+
+    def test_rejects_invalid_cursors(self):
+        endpoint = self.tasks.serve_pages(sort_keys=["rank"], page_size=10)
+        cursor = endpoint.page()["cursor"]
+
+        for bad in (
+            "garbage",
+            cursor[:-4],
+            forge(cursor, sort="status"),
+            forge(cursor, version=99),
+            forge(cursor, descending="yes"),
+            forge(cursor, seen="[1]"),
+        ):
+            with self.subTest(cursor=bad), self.assertRaises(ValueError):
+                endpoint.page(cursor=bad)
+
+    def test_rejects_cursors_of_other_endpoints(self):
+        first = self.tasks.serve_pages(sort_keys=["rank"], name="first", page_size=10)
+        second = self.tasks.serve_pages(sort_keys=["rank"], name="second")
+
+        with self.assertRaises(ValueError):
+            second.page(cursor=first.page()["cursor"])
+
+    def test_rejects_cursors_listing_too_many_rows(self):
+        endpoint = self.tasks.serve_pages(sort_keys=["rank"], page_size=10, max_ties=20)
+        cursor = endpoint.page()["cursor"]
+
+        forged = forge(cursor, seen=[f"[1,{i}]" for i in range(21)])
+        with self.assertRaises(ValueError):
+            endpoint.page(cursor=forged)
+
+    def test_too_many_ties(self):
+        endpoint = self.tasks.serve_pages(sort_keys=["status"], page_size=10, max_ties=20)
+
+        with self.assertRaises(ValueError):
+            walk(endpoint)
+
+    def test_authorize(self):
+        endpoint = self.tasks.serve_pages(sort_keys=["rank"], authorize=lambda: False)
+
+        with self.assertRaises(PermissionError):
+            endpoint.page()
+
+
+if __name__ == "__main__":
+    unittest.main()
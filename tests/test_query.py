@@ -0,0 +1,50 @@
+"""Tests for MyTable.query against the in-memory Anvil stand-in.
+
+Run from the repository root:
+
+    python -m unittest discover tests
+"""
+
+import unittest
+
+from stand_in import fake_anvil, mt
+
+
+class QueryTest(unittest.TestCase):
+    def setUp(self):
+        fake_anvil.drop_tables()
+        fake_anvil.add_table("items", [("rank", "number"), ("name", "string")])
+        self.items = mt.MyTable("items")
+        self.items.add_rows(
+            {"rank": i, "name": f"item_{i}" if i % 2 else f"item {i}"} for i in range(20)
+        )
+
+    def ranks(self, query) -> list:
+        return sorted(row["rank"] for row in query)
+
+    def test_lookups_are_pushed_down(self):
+        query = self.items.query().where(rank__gte=5, rank__lt=8, name__startswith="item")
+
+        args, kwargs = query.compile()
+        self.assertEqual(list(kwargs), ["rank", "name"])
+        self.assertEqual(self.ranks(query), [5, 6, 7])
+
+    def test_wildcards_fall_back_to_python(self):
+        with self.assertWarns(mt.PushdownWarning):
+            query = self.items.query().where(name__contains="_1")
+
+        self.assertEqual(self.ranks(query), [1, 11, 13, 15, 17, 19])
+
+    def test_regex_falls_back_to_python(self):
+        with self.assertWarns(mt.PushdownWarning):
+            query = self.items.query().where(name__regex=r" 1\d$")
+
+        self.assertEqual(self.ranks(query), [10, 12, 14, 16, 18])
+
+    def test_unknown_lookup(self):
+        with self.assertRaises(ValueError):
+            self.items.query().where(rank__nope=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
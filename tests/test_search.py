@@ -0,0 +1,33 @@
+"""Tests for MyTable.search against the in-memory Anvil stand-in.
+
+Run from the repository root:
+
+    python -m unittest discover tests
+"""
+
+import unittest
+
+from stand_in import fake_anvil, mt
+
+
+class SearchTest(unittest.TestCase):
+    def setUp(self):
+        fake_anvil.drop_tables()
+        fake_anvil.add_table("numbers", [("value", "number")])
+        self.numbers = mt.MyTable("numbers")
+        self.numbers.add_rows({"value": i} for i in range(250))
+
+    def test_streams_every_row(self):
+        values = [row["value"] for row in self.numbers.search(page_size=40)]
+        self.assertEqual(values, list(range(250)))
+
+    def test_convert_limit_is_deprecated_and_ignored(self):
+        with self.assertWarns(DeprecationWarning):
+            search = self.numbers.search(convert_limit=10)
+
+        self.assertIsInstance(search, mt.MySearchIterator)
+        self.assertEqual(len(list(search)), 250)
+
+
+if __name__ == "__main__":
+    unittest.main()